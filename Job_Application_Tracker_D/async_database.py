@@ -0,0 +1,155 @@
+import queue
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from database import DatabaseManager
+
+READ_METHODS = (
+    "get_application",
+    "get_applications",
+    "get_all_applications",
+    "get_applications_by_status",
+    "get_upcoming_deadlines",
+    "search_applications",
+    "get_applications_page",
+    "get_application_ids",
+    "count_applications",
+    "get_change_version",
+    "get_changes_since",
+    "get_statistics",
+    "get_deadline_days",
+    "get_export_watermark",
+)
+
+WRITE_METHODS = (
+    "add_application",
+    "update_application",
+    "delete_application",
+    "add_applications_many",
+    "update_applications_many",
+    "delete_applications_many",
+    "set_status_many",
+    "shift_deadlines_many",
+    "rebuild_search_index",
+    "backfill_deadline_days",
+    "prune_changes",
+    "rebuild_statistics",
+    "set_export_watermark",
+    "clear_export_watermark",
+)
+
+
+class AsyncDatabaseManager:
+    def __init__(self, db=None, root=None, readers=2, poll_interval=15, **db_options):
+        self.db = db if db is not None else DatabaseManager(**db_options)
+        self.root = root
+        self.poll_interval = poll_interval
+
+        # SQLite allows one writer at a time, so writes are serialized on a
+        # single thread while WAL lets several reader threads run alongside it
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="db-reader")
+
+        # Results waiting to be delivered on the Tk thread
+        self._results = queue.Queue()
+        self._pending = 0
+        self._polling = False
+        self._latest = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def submit(self, method, *args, callback=None, errback=None, key=None, **kwargs):
+        if method in WRITE_METHODS:
+            executor = self._writer
+        elif method in READ_METHODS:
+            executor = self._readers
+        else:
+            raise AttributeError(f"DatabaseManager has no queryable method {method!r}")
+
+        future = executor.submit(getattr(self.db, method), *args, **kwargs)
+        if key is not None:
+            # A newer read with the same key supersedes the previous one
+            with self._lock:
+                previous = self._latest.get(key)
+                self._latest[key] = future
+            if previous is not None:
+                previous.cancel()
+
+        if callback is not None or errback is not None:
+            if self.root is not None:
+                self._pending += 1
+                future.add_done_callback(lambda done: self._results.put((done, key, callback, errback)))
+                self._schedule_poll()
+            else:
+                future.add_done_callback(lambda done: self._deliver(done, key, callback, errback))
+        return future
+
+    def is_current(self, key, future):
+        with self._lock:
+            return self._latest.get(key) is future
+
+    def _deliver(self, future, key, callback, errback):
+        if self._closed or future.cancelled() or (key is not None and not self.is_current(key, future)):
+            return
+        if key is not None:
+            with self._lock:
+                self._latest.pop(key, None)
+        try:
+            result = future.result()
+        except CancelledError:
+            return
+        except Exception as error:
+            if errback is not None:
+                errback(error)
+            return
+        if callback is not None:
+            callback(result)
+
+    def _schedule_poll(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_interval, self._drain)
+
+    def _drain(self):
+        # Runs on the Tk thread; tkinter widgets must not be touched elsewhere
+        self._polling = False
+        while True:
+            try:
+                future, key, callback, errback = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            self._deliver(future, key, callback, errback)
+        if self._pending > 0:
+            self._schedule_poll()
+
+    def cancel(self, key):
+        with self._lock:
+            future = self._latest.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def close(self):
+        # Callbacks still queued for the Tk thread are dropped after closing
+        self._closed = True
+        self._readers.shutdown(wait=True, cancel_futures=True)
+        self._writer.shutdown(wait=True)
+        self.db.close()
+
+
+def _async_method(name):
+    async def method(self, *args, **kwargs):
+        # asyncio is slow to import and only needed by coroutine callers
+        import asyncio
+        return await asyncio.wrap_future(self.submit(name, *args, **kwargs))
+    method.__name__ = name
+    return method
+
+
+for _name in READ_METHODS + WRITE_METHODS:
+    setattr(AsyncDatabaseManager, _name, _async_method(_name))
@@ -12,7 +12,15 @@ import time
 class AuthenticationManager:
     def __init__(self, db_name="users.db"):
         self.db_name = db_name
-        self.init_db()
+        self.initialized = False
+    
+    def connect(self):
+        # The schema is created on first use rather than in the constructor,
+        # so the login window draws before the database is touched
+        if not self.initialized:
+            self.init_db()
+            self.initialized = True
+        return sqlite3.connect(self.db_name)
     
     def init_db(self):
         with sqlite3.connect(self.db_name) as conn:
@@ -69,7 +77,7 @@ class AuthenticationManager:
         password_hash, salt = self.hash_password(password)
         
         # Store user in database
-        with sqlite3.connect(self.db_name) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 'INSERT INTO users (username, email, password_hash, salt) VALUES (?, ?, ?, ?)',
@@ -82,7 +90,7 @@ class AuthenticationManager:
     def verify_user(self, email, password):
 
         # Get user data from database
-        with sqlite3.connect(self.db_name) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 'SELECT password_hash, salt FROM users WHERE email = ?',
@@ -107,7 +115,7 @@ class AuthenticationManager:
             return False, "Invalid password"
     
     def user_exists(self, username):
-        with sqlite3.connect(self.db_name) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 'SELECT id FROM users WHERE username = ?',
@@ -116,7 +124,7 @@ class AuthenticationManager:
             return cursor.fetchone() is not None
     
     def email_exists(self, email):
-        with sqlite3.connect(self.db_name) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 'SELECT id FROM users WHERE email = ?',
@@ -150,7 +158,7 @@ class AuthenticationManager:
         
         token = self.generate_reset_token()
         
-        with sqlite3.connect(self.db_name) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
 
             # Remove any existing tokens for this email
@@ -173,7 +181,7 @@ class AuthenticationManager:
 
         # Validate token
 
-        with sqlite3.connect(self.db_name) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 'SELECT * FROM password_resets WHERE email = ? AND token = ? AND expires_at > datetime("now")',
@@ -213,7 +221,7 @@ class AuthenticationManager:
             return False, "Password must be at least 8 characters with uppercase, lowercase, number, and special character"
         
         # Update password
-        with sqlite3.connect(self.db_name) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
             password_hash, salt = self.hash_password(new_password)
             cursor.execute(
@@ -0,0 +1,548 @@
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from database import SORT_COLUMNS, DatabaseManager
+from models import JobApplication
+
+STATUSES = ["Applied", "Interview", "Offer", "Rejected", "No Response"]
+
+
+def make_application(i):
+    return JobApplication(
+        company=f"Company {i % 500}",
+        role=f"Role {i % 37}",
+        status=STATUSES[i % len(STATUSES)],
+        deadline=f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+        notes=f"Referral from contact {i}"
+    )
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for i in range(repeat):
+        func(i)
+    return (time.perf_counter() - start) / repeat
+
+
+def report(name, seconds):
+    print(f"{name:<40} {seconds * 1e6:10.1f} us/call")
+
+
+def bench_connections(workdir, repeat=500):
+    # Previous behaviour: a fresh connection for every call
+    path = os.path.join(workdir, "per_call.db")
+    DatabaseManager(path).close()
+
+    def per_call_insert(i):
+        app = make_application(i)
+        with sqlite3.connect(path) as conn:
+            conn.execute(
+                'INSERT INTO applications (company, role, status, deadline, notes) VALUES (?, ?, ?, ?, ?)',
+                (app.company, app.role, app.status, app.deadline, app.notes))
+            conn.commit()
+
+    def per_call_read(i):
+        with sqlite3.connect(path) as conn:
+            conn.row_factory = sqlite3.Row
+            conn.execute('SELECT * FROM applications WHERE id=?', (i + 1,)).fetchall()
+
+    report("insert, connection per call", timed(per_call_insert, repeat))
+    report("point read, connection per call", timed(per_call_read, repeat))
+
+    with DatabaseManager(os.path.join(workdir, "pooled.db")) as db:
+        def pooled_read(i):
+            db.get_connection().execute('SELECT * FROM applications WHERE id=?', (i + 1,)).fetchall()
+
+        report("insert, pooled connection", timed(lambda i: db.add_application(make_application(i)), repeat))
+        report("point read, pooled connection", timed(pooled_read, repeat))
+
+
+def bench_bulk_insert(workdir, count=100000):
+    with DatabaseManager(os.path.join(workdir, "bulk_single.db")) as db:
+        sample = min(count, 5000)
+        start = time.perf_counter()
+        for i in range(sample):
+            db.add_application(make_application(i))
+        single = (time.perf_counter() - start) / sample
+
+    with DatabaseManager(os.path.join(workdir, "bulk_many.db")) as db:
+        start = time.perf_counter()
+        db.add_applications_many(make_application(i) for i in range(count))
+        many = (time.perf_counter() - start) / count
+
+    print(f"{'add_application':<40} {1 / single:10.0f} rows/s")
+    print(f"{'add_applications_many':<40} {1 / many:10.0f} rows/s")
+
+
+def bench_search(workdir, count=100000, repeat=50):
+    with DatabaseManager(os.path.join(workdir, "search.db")) as db:
+        db.add_applications_many(make_application(i) for i in range(count))
+        report("search, FTS5", timed(lambda i: db.search_applications(f"contact {i * 997}"), repeat))
+        db.fts_enabled = False
+        report("search, LIKE scan", timed(lambda i: db.search_applications(f"contact {i * 997}"), repeat))
+
+
+def bench_tenancy(workdir, users=10000, rows_per_user=20, samples=200):
+    tenant_dir = os.path.join(workdir, "tenancy")
+    os.makedirs(tenant_dir)
+    names = [f"user{u}" for u in range(users)]
+    rows = [make_application(i) for i in range(rows_per_user)]
+
+    for name in names:
+        with DatabaseManager(os.path.join(tenant_dir, f"job_applications_{name}.db")) as db:
+            db.add_applications_many(rows)
+    shared_path = os.path.join(tenant_dir, "job_applications.db")
+    for name in names:
+        with DatabaseManager(shared_path, username=name, shared=True) as db:
+            db.add_applications_many(rows)
+
+    sampled = random.Random(42).sample(names, min(samples, users))
+    layouts = {
+        "per-user files": lambda name: DatabaseManager(
+            os.path.join(tenant_dir, f"job_applications_{name}.db")),
+        "shared database": lambda name: DatabaseManager(shared_path, username=name, shared=True),
+    }
+    for layout, open_db in layouts.items():
+        login = query = 0.0
+        for name in sampled:
+            start = time.perf_counter()
+            db = open_db(name)
+            db.get_all_applications()
+            login += time.perf_counter() - start
+
+            start = time.perf_counter()
+            db.get_applications_page(status="Offer", page_size=50)
+            query += time.perf_counter() - start
+            db.close()
+        report(f"login, {layout}", login / len(sampled))
+        report(f"status page query, {layout}", query / len(sampled))
+
+
+def check_query_plans(workdir):
+    # Every public read must be answered by an index search, never a table
+    # or full index scan
+    with DatabaseManager(os.path.join(workdir, "plans.db"), username="planner", shared=True,
+                         result_cache_entries=0) as db:
+        db.add_applications_many(make_application(i) for i in range(2000))
+        db.get_connection().execute('ANALYZE')
+
+        statements = []
+        db.get_connection().set_trace_callback(statements.append)
+        rows, token = db.get_applications_page(status="Offer", page_size=10)
+        queries = {
+            "get_application": lambda: db.get_application(1),
+            "get_applications": lambda: db.get_applications([1, 2, 3]),
+            "get_all_applications": db.get_all_applications,
+            "get_applications_by_status": lambda: db.get_applications_by_status("Offer"),
+            "get_upcoming_deadlines": lambda: db.get_upcoming_deadlines(30),
+            "get_deadline_days": lambda: db.get_deadline_days(0),
+            "search_applications": lambda: db.search_applications("referral"),
+            "get_applications_page": lambda: db.get_applications_page(page_size=10),
+            "get_applications_page (next)": lambda: db.get_applications_page(
+                status="Offer", page_size=10, token=token),
+            "iter_applications": lambda: list(db.iter_applications(status="Offer")),
+            "count_applications": lambda: db.count_applications(status="Offer"),
+        }
+        # Every sortable column, both directions, with and without a status
+        # filter, including the continuation query
+        for sort in SORT_COLUMNS:
+            for descending in (False, True):
+                for status in (None, "Offer"):
+                    def sorted_pages(sort=sort, descending=descending, status=status):
+                        rows, token = db.get_applications_page(status=status, page_size=10,
+                                                               sort=sort, descending=descending)
+                        db.get_applications_page(status=status, page_size=10, token=token,
+                                                 sort=sort, descending=descending)
+                    name = f"page by {sort}{' desc' if descending else ''}{', status' if status else ''}"
+                    queries[name] = sorted_pages
+
+        failures = []
+        for name, query in queries.items():
+            statements.clear()
+            query()
+            for statement in [sql for sql in statements if sql.lstrip().startswith("SELECT")]:
+                plan = [row["detail"] for row in
+                        db.get_connection().execute(f"EXPLAIN QUERY PLAN {statement}")]
+                # SCAN ... USING INDEX still reads the whole index, so only the
+                # FTS virtual table step may scan
+                scans = [step for step in plan if step.startswith("SCAN") and "VIRTUAL TABLE" not in step]
+                print(f"{name:<40} {'; '.join(plan)}")
+                if scans:
+                    failures.append(name)
+        db.get_connection().set_trace_callback(None)
+
+    if failures:
+        raise AssertionError(f"Queries scanning a table or index: {', '.join(failures)}")
+
+
+def bench_treeview_refresh(workdir, count=50000):
+    import tkinter as tk
+    from gui import JobApplicationTracker
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        print("skipped: no display available")
+        return
+    root.withdraw()
+
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        tracker = JobApplicationTracker(root, "benchmark", virtual_list=False, in_memory_index=False)
+        ids = tracker.db.add_applications_many(make_application(i) for i in range(count))
+        tracker.load_applications()
+        root.update()
+
+        # Previous behaviour: clear the Treeview and insert every row again
+        start = time.perf_counter()
+        tracker.tree.delete(*tracker.tree.get_children())
+        for app in tracker.db.get_all_applications():
+            tracker.tree.insert("", "end", values=(app["id"], app["company"], app["role"],
+                                                  app["status"], app["deadline"] or "", app["notes"] or ""))
+        root.update()
+        report("full Treeview reload", time.perf_counter() - start)
+
+        tracker.tree_order, tracker.tree_values = [], {}
+        tracker.tree.delete(*tracker.tree.get_children())
+        tracker.load_applications()
+        changed = tracker.db.get_application(ids[count // 2])
+        changed.notes = "Updated after phone screen"
+        tracker.db.update_application(changed)
+        start = time.perf_counter()
+        tracker.load_applications()
+        root.update()
+        report("diff refresh, one row changed", time.perf_counter() - start)
+        tracker.db.close()
+    finally:
+        os.chdir(cwd)
+        root.destroy()
+
+
+def bench_columnar_index(workdir, count=200000, repeat=20):
+    from columnar_index import ApplicationIndex
+    with DatabaseManager(os.path.join(workdir, "columnar.db"), result_cache_entries=0) as db:
+        db.add_applications_many(make_application(i) for i in range(count))
+        start = time.perf_counter()
+        index = ApplicationIndex(db)
+        report("build columnar index", time.perf_counter() - start)
+
+        report("filter + search, SQLite", timed(
+            lambda i: db.get_application_ids(status="Offer", search_term=f"role {i}"), repeat))
+        report("filter + search, in memory", timed(
+            lambda i: index.query(status="Offer", search_term=f"role {i}"), repeat))
+        report("filter + search + sort by company, in memory", timed(
+            lambda i: index.query(status="Offer", search_term=f"role {i}", sort="company"), repeat))
+
+
+def bench_row_memory(workdir, count=500000):
+    # Per-row footprint and load time of the old dict(sqlite3.Row) results
+    # against JobApplication objects built by the cursor row factory
+    import tracemalloc
+    from models import FIELDS
+    with DatabaseManager(os.path.join(workdir, "row_memory.db"), result_cache_entries=0) as db:
+        db.add_applications_many(make_application(i) for i in range(count))
+        query = f"SELECT {', '.join(FIELDS)} FROM applications WHERE user_id=? ORDER BY id"
+
+        def load_dicts():
+            cursor = db.get_connection().cursor()
+            cursor.execute(query, (db.user_id,))
+            return [dict(row) for row in cursor.fetchall()]
+
+        def load_objects():
+            cursor = db.get_connection().cursor()
+            cursor.row_factory = JobApplication.from_row
+            cursor.execute(query, (db.user_id,))
+            return cursor.fetchall()
+
+        for name, load in (("dict rows", load_dicts), ("JobApplication rows", load_objects)):
+            tracemalloc.start()
+            start = time.perf_counter()
+            rows = load()
+            elapsed = time.perf_counter() - start
+            size, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            # Untraced timing, since tracemalloc slows every allocation
+            del rows
+            start = time.perf_counter()
+            rows = load()
+            untraced = time.perf_counter() - start
+            del rows
+            print(f"{name:<40} {size / count:8.0f} bytes/row {count / untraced:10.0f} rows/s"
+                  f" ({count / elapsed:.0f} rows/s traced)")
+
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Startup must stay within these budgets; modules in DEFERRED_MODULES are
+# only needed after login or on export and must not load with the login window
+STARTUP_IMPORT_BUDGET = 0.25
+FIRST_WINDOW_BUDGET = 1.0
+DEFERRED_MODULES = ("pandas", "gui", "database", "export", "asyncio", "async_database")
+
+FIRST_WINDOW_SCRIPT = '''
+import sys, time
+import main
+app = main.MainApplication()
+app.root.update(); 1/0
+print(time.time() - float(sys.argv[1]))
+app.root.destroy()
+'''
+
+
+def import_times(module="main"):
+    # Parse `python -X importtime` output into {module: (self, cumulative)} seconds
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=APP_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(own) / 1e6, int(cumulative) / 1e6)
+    return times
+
+
+def first_window_time(workdir):
+    # Interpreter start to the login window's first drawn frame, measured in
+    # a fresh process so nothing is already imported; None without a display
+    if sys.platform not in ("win32", "darwin") and not os.environ.get("DISPLAY"):
+        return None
+    result = subprocess.run([sys.executable, "-c", FIRST_WINDOW_SCRIPT, repr(time.time())],
+                            cwd=workdir, env={**os.environ, "PYTHONPATH": APP_DIR},
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        if "TclError" in result.stderr and "display" in result.stderr:
+            return None
+        # Any other failure is a real startup error, not a missing display
+        raise RuntimeError(f"First window failed:\n{result.stderr.strip()}")
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def bench_startup(workdir, top=15):
+    times = import_times()
+    print(f"{'module':<40} {'self ms':>10} {'total ms':>10}")
+    for name, (own, cumulative) in sorted(times.items(), key=lambda item: -item[1][1])[:top]:
+        print(f"{name:<40} {own * 1e3:10.1f} {cumulative * 1e3:10.1f}")
+
+    window = first_window_time(workdir)
+    if window is None:
+        print("time to first window: skipped, no display available")
+    else:
+        report("time to first window", window)
+
+
+def check_startup_budget(workdir):
+    times = import_times()
+    total = times["main"][1]
+    loaded = [name for name in DEFERRED_MODULES if name in times]
+    print(f"{'import main':<40} {total * 1e3:10.1f} ms (budget {STARTUP_IMPORT_BUDGET * 1e3:.0f} ms)")
+    if loaded:
+        raise AssertionError(f"Deferred modules imported at startup: {', '.join(loaded)}")
+    if total > STARTUP_IMPORT_BUDGET:
+        raise AssertionError(f"import main took {total * 1e3:.0f} ms")
+
+    window = first_window_time(workdir)
+    if window is None:
+        print("time to first window: skipped, no display available")
+        return
+    print(f"{'time to first window':<40} {window * 1e3:10.1f} ms (budget {FIRST_WINDOW_BUDGET * 1e3:.0f} ms)")
+    if window > FIRST_WINDOW_BUDGET:
+        raise AssertionError(f"First window took {window * 1e3:.0f} ms")
+
+
+EXPORT_SCRIPT = '''
+import os, resource, sys, time
+from database import DatabaseManager
+from export import ExportManager
+db_path, method, filename = sys.argv[1:]
+db = DatabaseManager(db_path, result_cache_entries=0)
+start = time.perf_counter()
+if method == "pandas":
+    # Previous behaviour: a list of dicts, then a DataFrame, then the file
+    import pandas as pd
+    df = pd.DataFrame([app.to_dict() for app in db.get_all_applications()])
+    if filename.endswith(".xlsx"):
+        df.to_excel(filename, index=False)
+    else:
+        df.to_csv(filename, index=False)
+elif filename.endswith(".xlsx"):
+    ExportManager.to_excel(db.iter_applications(batch_size=5000), filename)
+else:
+    ExportManager.to_csv(db.iter_applications(batch_size=5000), filename)
+elapsed = time.perf_counter() - start
+# ru_maxrss survives fork and exec, so it would report the parent's peak;
+# VmHWM belongs to this process image only
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if os.path.exists("/proc/self/status"):
+    with open("/proc/self/status") as status:
+        peak = next(int(line.split()[1]) for line in status if line.startswith("VmHWM:"))
+print(elapsed, peak)
+'''
+
+
+def run_exports(workdir, name, count, outputs):
+    # Each exporter runs in its own process so peak RSS is measured separately
+    path = os.path.join(workdir, f"{name}.db")
+    with DatabaseManager(path) as db:
+        db.add_applications_many(make_application(i) for i in range(count))
+
+    for method, filename in outputs:
+        result = subprocess.run([sys.executable, "-c", EXPORT_SCRIPT, path, method,
+                                 os.path.join(workdir, filename)],
+                                cwd=APP_DIR, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"{filename:<40} skipped: {result.stderr.strip().splitlines()[-1]}")
+            continue
+        elapsed, peak_kib = result.stdout.split()
+        size = os.path.getsize(os.path.join(workdir, filename))
+        print(f"{filename:<40} {count / float(elapsed):10.0f} rows/s {int(peak_kib) / 1024:8.1f} MiB peak RSS"
+              f" {size / 2 ** 20:8.1f} MiB file")
+
+
+def bench_csv_export(workdir, count=1000000):
+    run_exports(workdir, "csv_export", count, (("pandas", "pandas.csv"), ("streaming", "streaming.csv"),
+                                               ("streaming", "streaming.csv.gz")))
+
+
+def bench_excel_export(workdir, count=1100000):
+    # More rows than one worksheet holds, so the streaming writer splits sheets
+    run_exports(workdir, "excel_export", count, (("pandas", "pandas.xlsx"), ("streaming", "streaming.xlsx")))
+
+
+def bench_columnar_export(workdir, count=500000):
+    # Write and read-back time for CSV against the typed columnar formats
+    import csv
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from export import ExportManager
+    with DatabaseManager(os.path.join(workdir, "columnar_export.db"), result_cache_entries=0) as db:
+        db.add_applications_many(make_application(i) for i in range(count))
+        def read_csv(path):
+            with open(path, newline="") as handle:
+                return sum(1 for _ in csv.reader(handle))
+
+        readers = {
+            "csv": read_csv,
+            "parquet": lambda path: pq.read_table(path).num_rows,
+            "arrow": lambda path: pa.ipc.open_file(path).read_all().num_rows,
+        }
+        for extension, reader in readers.items():
+            path = os.path.join(workdir, f"applications.{extension}")
+            export = getattr(ExportManager, f"to_{extension}")
+            start = time.perf_counter()
+            export(db.iter_applications(batch_size=5000), path)
+            written = time.perf_counter() - start
+            start = time.perf_counter()
+            reader(path)
+            read = time.perf_counter() - start
+            print(f"{extension:<40} {count / written:10.0f} rows/s write {count / read:12.0f} rows/s read"
+                  f" {os.path.getsize(path) / 2 ** 20:8.1f} MiB")
+
+        start = time.perf_counter()
+        with DatabaseManager(os.path.join(workdir, "parquet_import.db")) as target:
+            ExportManager.from_parquet(os.path.join(workdir, "applications.parquet"), target)
+        print(f"{'parquet import':<40} {count / (time.perf_counter() - start):10.0f} rows/s")
+
+
+def bench_delta_export(workdir, count=500000, changed=100):
+    # Full re-export against a delta of a few changed rows: written as its
+    # own file, and merged into the previous full export
+    from export import ExportManager
+    with DatabaseManager(os.path.join(workdir, "delta_export.db"), result_cache_entries=0) as db:
+        ids = db.add_applications_many(make_application(i) for i in range(count))
+        for extension in ("csv", "jsonl"):
+            full = os.path.join(workdir, f"full.{extension}")
+            start = time.perf_counter()
+            ExportManager.export_delta(db, full, merge=True)
+            report(f"full export, {extension}", time.perf_counter() - start)
+            delta = os.path.join(workdir, f"delta.{extension}")
+            ExportManager.export_delta(db, delta)
+
+            for app_id in random.sample(ids, changed):
+                app = db.get_application(app_id)
+                if app is not None:
+                    app.notes = f"{app.notes} (updated)"
+                    db.update_application(app)
+            db.delete_applications_many(ids[-changed:])
+            ids = ids[:-changed]
+
+            start = time.perf_counter()
+            ExportManager.export_delta(db, delta)
+            report(f"delta file, {extension}", time.perf_counter() - start)
+            start = time.perf_counter()
+            ExportManager.export_delta(db, full, merge=True)
+            report(f"delta merged into full export, {extension}", time.perf_counter() - start)
+
+
+def check_delta_merge(workdir):
+    # Merging into exports whose last line has no line break, as left by
+    # editors and other tools, must still give one record per application
+    import csv
+    import json
+    from export import EXPORT_COLUMNS, ExportManager
+    with DatabaseManager(os.path.join(workdir, "delta_merge.db"), result_cache_entries=0) as db:
+        # The last row holds quotes and a line break, so its record spans lines
+        last = db.get_application(db.add_applications_many(make_application(i) for i in range(20))[-1])
+        last.notes = 'Said "call back"\nnext week'
+        db.update_application(last)
+        for extension in ("csv", "jsonl"):
+            filename = os.path.join(workdir, f"merge.{extension}")
+            ids = db.get_application_ids(sort="id")
+            ExportManager.export_delta(db, filename, merge=True)
+            with open(filename, "rb+") as handle:
+                handle.seek(-2 if extension == "csv" else -1, os.SEEK_END)
+                handle.truncate()
+
+            app = db.get_application(ids[0])
+            app.status = "Offer"
+            db.update_application(app)
+            db.delete_applications_many(ids[1:2])
+            db.add_applications_many(make_application(i) for i in range(2))
+            ExportManager.export_delta(db, filename, merge=True)
+
+            with open(filename, encoding="utf-8", newline="") as handle:
+                if extension == "csv":
+                    merged = list(csv.DictReader(handle))
+                else:
+                    merged = [json.loads(line) for line in handle]
+            expected = [{column: app.get(column) for column in EXPORT_COLUMNS}
+                        for app in db.iter_applications(sort="id")]
+            if extension == "csv":
+                expected = [{column: "" if value is None else str(value) for column, value in row.items()}
+                            for row in expected]
+            if merged != expected:
+                raise AssertionError(f"Merged {extension} export does not match the database")
+            print(f"{'merge without trailing newline, ' + extension:<40} ok")
+
+
+BENCHMARKS = {
+    "connections": bench_connections,
+    "bulk_insert": bench_bulk_insert,
+    "search": bench_search,
+    "tenancy": bench_tenancy,
+    "query_plans": check_query_plans,
+    "treeview_refresh": bench_treeview_refresh,
+    "columnar_index": bench_columnar_index,
+    "row_memory": bench_row_memory,
+    "startup": bench_startup,
+    "startup_budget": check_startup_budget,
+    "csv_export": bench_csv_export,
+    "excel_export": bench_excel_export,
+    "columnar_export": bench_columnar_export,
+    "delta_export": bench_delta_export,
+    "delta_merge": check_delta_merge,
+}
+
+
+if __name__ == "__main__":
+    selected = sys.argv[1:] or list(BENCHMARKS)
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in selected:
+            print(f"== {name} ==")
+            BENCHMARKS[name](workdir)
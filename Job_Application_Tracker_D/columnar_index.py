@@ -0,0 +1,220 @@
+import array
+import heapq
+import re
+import sys
+import unicodedata
+from bisect import bisect_left
+from collections import OrderedDict
+
+NO_DEADLINE = -2 ** 31
+
+# Bit offsets set in each byte value, used to walk a bitset quickly
+BYTE_BITS = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def _normalize(text):
+    # Fold case and strip diacritics like FTS5's unicode61 tokenizer, so
+    # the in-memory index and SQLite find the same rows (epee matches épée)
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _set_bit(bits, position):
+    needed = (position >> 3) + 1
+    if len(bits) < needed:
+        bits.extend(bytes(needed - len(bits)))
+    bits[position >> 3] |= 1 << (position & 7)
+
+
+def _clear_bit(bits, position):
+    if position >> 3 < len(bits):
+        bits[position >> 3] &= ~(1 << (position & 7)) & 0xFF
+
+
+def _test_bit(bits, position):
+    return position >> 3 < len(bits) and bits[position >> 3] >> (position & 7) & 1
+
+
+def _positions(value, size):
+    data = value.to_bytes(size, 'little')
+    positions = []
+    for index, byte in enumerate(data):
+        if byte:
+            base = index << 3
+            positions.extend(base + bit for bit in BYTE_BITS[byte])
+    return positions
+
+
+class ApplicationIndex:
+    def __init__(self, db, rebuild_ratio=0.1, prefix_cache_size=64):
+        # Column-oriented snapshot of one user's applications. Each row owns a
+        # slot; slots are laid out in (deadline, id) order when built, and
+        # changed rows are appended to an unsorted tail until the next rebuild.
+        self.db = db
+        self.rebuild_ratio = rebuild_ratio
+        # Typing extends the same words, so recent prefix expansions are reused
+        self.prefix_cache_size = prefix_cache_size
+        self.prefix_cache = OrderedDict()
+        self.version = None
+        self.build()
+
+    def build(self):
+        # Read the version first: changes racing with the scan are re-applied,
+        # which is harmless because applying a change is idempotent
+        self.version = self.db.get_change_version()
+
+        self.ids = array.array('q')
+        self.deadline_days = array.array('i')
+        self.status_codes = array.array('B')
+        self.companies = []
+        self.roles = []
+        self.status_names = []
+        self.status_lookup = {}
+        self.status_bits = []
+        self.live_bits = bytearray()
+        self.postings = {}
+        self.sorted_tokens = None
+        self.prefix_cache.clear()
+        self.slot_of = {}
+
+        for row in self.db.iter_applications():
+            self._append(row)
+        self.sorted_length = len(self.ids)
+
+    def __len__(self):
+        return len(self.slot_of)
+
+    def _status_code(self, status):
+        code = self.status_lookup.get(status)
+        if code is None:
+            code = len(self.status_names)
+            self.status_names.append(status)
+            self.status_lookup[status] = code
+            self.status_bits.append(bytearray())
+        return code
+
+    def _append(self, row):
+        slot = len(self.ids)
+        code = self._status_code(row["status"])
+        deadline_day = row["deadline_day"]
+
+        self.ids.append(row["id"])
+        self.deadline_days.append(NO_DEADLINE if deadline_day is None else deadline_day)
+        self.status_codes.append(code)
+        # Interning keeps one copy of repeated company and role names
+        self.companies.append(sys.intern(row["company"]))
+        self.roles.append(sys.intern(row["role"]))
+        _set_bit(self.status_bits[code], slot)
+        _set_bit(self.live_bits, slot)
+        self.slot_of[row["id"]] = slot
+
+        text = ' '.join(value for value in (row["company"], row["role"], row["notes"]) if value)
+        for token in set(TOKEN_PATTERN.findall(_normalize(text))):
+            postings = self.postings.get(token)
+            if postings is None:
+                postings = self.postings[token] = array.array('I')
+                self.sorted_tokens = None
+            postings.append(slot)
+        self.prefix_cache.clear()
+
+    def _remove(self, application_id):
+        slot = self.slot_of.pop(application_id, None)
+        if slot is not None:
+            # Postings keep the dead slot; it is filtered out by live_bits
+            _clear_bit(self.live_bits, slot)
+            _clear_bit(self.status_bits[self.status_codes[slot]], slot)
+
+    def apply_changes(self):
+        return self.apply(*self.db.get_changes_since(self.version))
+
+    def apply(self, changes, version):
+        # Changes read from get_changes_since(self.version), possibly on
+        # another thread
+        self.version = version
+        for change in changes:
+            self._remove(change["id"])
+            if not change["deleted"]:
+                self._append(change["application"])
+
+        # Too many unsorted or dead slots make queries slower than a rebuild
+        tail = len(self.ids) - self.sorted_length
+        if tail > max(1000, self.rebuild_ratio * len(self.ids)):
+            self.build()
+        return len(changes)
+
+    def _token_slots(self, prefix):
+        slots = self.prefix_cache.get(prefix)
+        if slots is not None:
+            self.prefix_cache.move_to_end(prefix)
+            return slots
+
+        if self.sorted_tokens is None:
+            self.sorted_tokens = sorted(self.postings)
+        slots = set()
+        index = bisect_left(self.sorted_tokens, prefix)
+        while index < len(self.sorted_tokens) and self.sorted_tokens[index].startswith(prefix):
+            slots.update(self.postings[self.sorted_tokens[index]])
+            index += 1
+
+        # Cached sets are shared between queries and never mutated
+        self.prefix_cache[prefix] = slots
+        if len(self.prefix_cache) > self.prefix_cache_size:
+            self.prefix_cache.popitem(last=False)
+        return slots
+
+    def _matching_slots(self, status, search_term):
+        code = self.status_lookup.get(status) if status else None
+        if status and code is None:
+            return []
+
+        # AND the status bitmap with the live bitmap
+        size = len(self.live_bits)
+        live = int.from_bytes(self.live_bits, 'little')
+        if code is not None:
+            live &= int.from_bytes(self.status_bits[code], 'little')
+
+        tokens = TOKEN_PATTERN.findall(_normalize(search_term)) if search_term else []
+        if not tokens:
+            return _positions(live, size)
+
+        # Every word must match as a prefix. Drive the intersection from the
+        # smallest candidate set: the rarest word, or the status bitmap when
+        # the words are common
+        groups = sorted((self._token_slots(token) for token in tokens), key=len)
+        if code is not None and live.bit_count() < len(groups[0]):
+            return [slot for slot in _positions(live, size)
+                    if all(slot in group for group in groups)]
+
+        slots = groups[0].intersection(*groups[1:])
+        status_codes = self.status_codes
+        return sorted(slot for slot in slots
+                      if _test_bit(self.live_bits, slot)
+                      and (code is None or status_codes[slot] == code))
+
+    def query(self, status=None, search_term=None, sort="deadline", descending=False):
+        slots = self._matching_slots(status, search_term)
+
+        if sort == "deadline":
+            # The built region is already in order; only the tail needs sorting
+            key = lambda slot: (self.deadline_days[slot], self.ids[slot])
+            split = bisect_left(slots, self.sorted_length)
+            tail = sorted(slots[split:], key=key)
+            ordered = list(heapq.merge(slots[:split], tail, key=key)) if tail else slots
+        else:
+            columns = {
+                "id": self.ids,
+                "company": self.companies,
+                "role": self.roles,
+                "status": [self.status_names[code] for code in self.status_codes],
+            }
+            values = columns[sort]
+            ordered = sorted(slots, key=lambda slot: (values[slot], self.ids[slot]))
+
+        if descending:
+            ordered.reverse()
+        ids = self.ids
+        return [ids[slot] for slot in ordered]
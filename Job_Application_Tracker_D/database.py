@@ -1,104 +1,881 @@
 import sqlite3
+import array
+import base64
+import json
 import os
-from datetime import datetime, timedelta
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date, datetime
+from itertools import islice
+from models import FIELDS, JobApplication
+
+APPLICATIONS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        company TEXT NOT NULL,
+        role TEXT NOT NULL,
+        status TEXT NOT NULL,
+        deadline TEXT,
+        deadline_day INTEGER,
+        notes TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        user_id TEXT NOT NULL DEFAULT ''
+    )
+'''
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# _deadline_day as an SQL function on every connection, so backfills and
+# bulk copies parse deadlines exactly like rows written from Python
+DEADLINE_DAY_SQL = "deadline_day_of(deadline)"
+
+# Sortable columns and the column each orders by. Every sort ends with id,
+# so ties are stable and keyset pagination never skips or repeats a row.
+SORT_COLUMNS = {
+    "deadline": "deadline_day",
+    "id": "id",
+    "company": "company",
+    "role": "role",
+    "status": "status",
+}
+NULLABLE_SORT_COLUMNS = {"deadline_day"}
+
+# Dashboard dimensions and the SQL computing each row's bucket
+STATISTICS_BUCKETS = (
+    ('status', "{row}.status"),
+    ('week', "date({row}.created_at, 'weekday 0', '-6 days')"),
+    ('deadline', "IFNULL({row}.deadline_day, '')"),
+)
+
+def _deadline_day(deadline):
+    # Deadlines are stored as YYYY-MM-DD text; deadline_day holds the same
+    # date as days since 1970-01-01 so range queries compare integers
+    if not deadline:
+        return None
+    try:
+        return datetime.strptime(deadline, "%Y-%m-%d").toordinal() - EPOCH_ORDINAL
+    except (ValueError, TypeError):
+        return None
+
+def _deadline_text(deadline):
+    # Parseable deadlines are stored zero-padded, e.g. 2025-1-5 as
+    # 2025-01-05, so the text always matches deadline_day
+    day = _deadline_day(deadline)
+    return deadline if day is None else date.fromordinal(day + EPOCH_ORDINAL).isoformat()
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+# Explicit column lists in JobApplication.from_row order; SELECT * would
+# follow the table, whose column order differs on upgraded databases
+APPLICATION_COLUMNS = ', '.join(FIELDS)
+JOINED_APPLICATION_COLUMNS = ', '.join(f'a.{field}' for field in FIELDS)
+
+def _user_from_filename(filename):
+    # Per-user databases are named job_applications_{username}.db
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    return stem[len("job_applications_"):]
+
+def _as_application(item):
+    if isinstance(item, dict):
+        return JobApplication.from_dict(item)
+    return item
+
+def _match_expression(tokens):
+    # Each word is matched as a quoted prefix so user input is never
+    # interpreted as FTS5 query syntax
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+def _sort_column(sort):
+    if sort not in SORT_COLUMNS:
+        raise ValueError(f"Cannot sort by {sort!r}; expected one of {', '.join(SORT_COLUMNS)}")
+    return SORT_COLUMNS[sort]
+
+def _order_by(sort, descending=False, prefix=''):
+    column = _sort_column(sort)
+    direction = ' DESC' if descending else ''
+    if column == 'id':
+        return f'{prefix}id{direction}'
+    return f'{prefix}{column}{direction}, {prefix}id{direction}'
+
+def _keyset_ranges(column, descending, sort_value, row_id):
+    # Rows after (sort_value, row_id) in ORDER BY column, id, as consecutive
+    # ranges in display order. NULLs sort first ascending and last descending,
+    # so a nullable column can need two ranges; each one is spelled out rather
+    # than as a row value so SQLite can seek the index.
+    if column == 'id':
+        return [('id < ?' if descending else 'id > ?', [row_id])]
+    if not descending:
+        if sort_value is None:
+            return [(f'{column} IS NULL AND id > ?', [row_id]), (f'{column} IS NOT NULL', [])]
+        return [(f'{column} >= ? AND ({column} > ? OR id > ?)', [sort_value, sort_value, row_id])]
+    if sort_value is None:
+        return [(f'{column} IS NULL AND id < ?', [row_id])]
+    ranges = [(f'{column} <= ? AND ({column} < ? OR id < ?)', [sort_value, sort_value, row_id])]
+    if column in NULLABLE_SORT_COLUMNS:
+        ranges.append((f'{column} IS NULL', []))
+    return ranges
+
+def _encode_token(key):
+    return base64.urlsafe_b64encode(json.dumps(key).encode('utf-8')).decode('ascii')
+
+def _decode_token(token):
+    try:
+        sort, descending, sort_value, row_id = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+        if sort not in SORT_COLUMNS or not isinstance(sort_value, (type(None), int, str)):
+            raise ValueError(token)
+        return sort, bool(descending), sort_value, int(row_id)
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid continuation token: {token!r}")
 
 class DatabaseManager:
-    def __init__(self, db_name="job_applications.db", username=None):
-        if username:
+    def __init__(self, db_name="job_applications.db", username=None, shared=False,
+                 cache_size=-8000, statement_cache=128, timeout=5.0,
+                 result_cache_entries=256, result_cache_ttl=None):
+        if username and not shared:
             # Create user-specific database
             db_name = f"job_applications_{username}.db"
         self.db_name = db_name
+        # In shared mode every user's rows live in one file, keyed by user_id;
+        # per-user files store their rows under the empty user id
+        self.user_id = username if shared and username else ''
+        # cache_size follows SQLite semantics: negative values are KiB
+        self.cache_size = cache_size
+        self.statement_cache = statement_cache
+        self.timeout = timeout
+
+        # One long-lived connection per thread, opened lazily and reused
+        self._connections = {}
+        self._lock = threading.Lock()
+
+        # LRU cache of read results; every committed write bumps the
+        # generation, which invalidates all entries cached before it
+        self.result_cache_entries = result_cache_entries
+        self.result_cache_ttl = result_cache_ttl
+        self._result_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._generation = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
         self.init_db()
-    
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_name, timeout=self.timeout,
+                               cached_statements=self.statement_cache,
+                               check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.create_function("deadline_day_of", 1, _deadline_day, deterministic=True)
+
+        # Connection tuning is applied once instead of on every call
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA cache_size={int(self.cache_size)}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA foreign_keys=ON')
+        return conn
+
+    def get_connection(self):
+        thread_id = threading.get_ident()
+        with self._lock:
+            conn = self._connections.get(thread_id)
+            if conn is None:
+                conn = self._connect()
+                self._connections[thread_id] = conn
+            return conn
+
+    @contextmanager
+    def transaction(self):
+        conn = self.get_connection()
+        with conn:
+            yield conn
+        self.invalidate_cache()
+
+    def invalidate_cache(self):
+        with self._cache_lock:
+            self._generation += 1
+            self._result_cache.clear()
+
+    def cache_stats(self):
+        with self._cache_lock:
+            return {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "entries": len(self._result_cache),
+                "generation": self._generation,
+            }
+
+    def _fetch_all(self, query, params=()):
+        # Rows come back as JobApplication objects. Cached results are shared
+        # between callers and must not be mutated.
+        key = (query, tuple(params))
+        with self._cache_lock:
+            entry = self._result_cache.get(key)
+            if entry is not None:
+                generation, stored_at, rows = entry
+                expired = (self.result_cache_ttl is not None
+                           and time.monotonic() - stored_at > self.result_cache_ttl)
+                if generation == self._generation and not expired:
+                    self._result_cache.move_to_end(key)
+                    self.cache_hits += 1
+                    return rows
+                del self._result_cache[key]
+            self.cache_misses += 1
+            generation = self._generation
+
+        cursor = self.get_connection().cursor()
+        cursor.row_factory = JobApplication.from_row
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+
+        with self._cache_lock:
+            # Skip storing if a write committed while the query ran
+            if self.result_cache_entries and generation == self._generation:
+                self._result_cache[key] = (generation, time.monotonic(), rows)
+                while len(self._result_cache) > self.result_cache_entries:
+                    self._result_cache.popitem(last=False)
+        return rows
+
+    def close(self):
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+
     def init_db(self):
-        with sqlite3.connect(self.db_name) as conn:
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            columns = {row["name"] for row in cursor.execute('PRAGMA table_info(applications)')}
+            if columns and not {'created_at', 'updated_at', 'user_id'} <= columns:
+                self._rebuild_applications_table(cursor, columns)
+            cursor.execute(APPLICATIONS_TABLE.format(table='applications'))
+
+            current = {row["name"] for row in cursor.execute('PRAGMA table_info(applications)')}
+            if 'deadline_day' not in current:
+                cursor.execute('ALTER TABLE applications ADD COLUMN deadline_day INTEGER')
+            if columns and 'deadline_day' not in columns:
+                self._backfill_deadline_days(cursor)
+
+            # Composite indexes lead with the user key so tenants never share
+            # a range, then serve status filters and deadline ordering/ranges
+            # directly; id is the keyset tiebreaker
+            for index in ('idx_status', 'idx_deadline', 'idx_deadline_page', 'idx_status_deadline_page',
+                          'idx_user_deadline_page', 'idx_user_status_deadline_page'):
+                cursor.execute(f'DROP INDEX IF EXISTS {index}')
+            # One pair per sortable column, with and without the status filter;
+            # (user_id, status, id) covers sorting by status and by id under a filter
+            for column in ('deadline_day', 'company', 'role'):
+                cursor.execute(f'''
+                    CREATE INDEX IF NOT EXISTS idx_user_{column}
+                    ON applications(user_id, {column}, id)
+                ''')
+                cursor.execute(f'''
+                    CREATE INDEX IF NOT EXISTS idx_user_status_{column}
+                    ON applications(user_id, status, {column}, id)
+                ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_status ON applications(user_id, status, id)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_id ON applications(user_id, id)')
+
+        self.init_change_log()
+        self.init_export_watermarks()
+        self.init_statistics()
+        self.fts_enabled = self.init_search_index()
+
+    def init_change_log(self):
+        # Every insert, update and delete appends a row here; version is a
+        # monotonically increasing change number and deletes act as tombstones
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute('''
-                CREATE TABLE IF NOT EXISTS applications (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    company TEXT NOT NULL,
-                    role TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    deadline TEXT,
-                    notes TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                CREATE TABLE IF NOT EXISTS application_changes (
+                    version INTEGER PRIMARY KEY AUTOINCREMENT,
+                    application_id INTEGER NOT NULL,
+                    user_id TEXT NOT NULL,
+                    operation TEXT NOT NULL,
+                    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             ''')
-            
-            # Create index for better performance
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_status ON applications(status)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_deadline ON applications(deadline)')
-            
-            conn.commit()
-    
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_changes_user_version
+                ON application_changes(user_id, version)
+            ''')
+            for operation, event, row in (('insert', 'INSERT', 'new'),
+                                          ('update', 'UPDATE', 'new'),
+                                          ('delete', 'DELETE', 'old')):
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS applications_change_{operation}
+                    AFTER {event} ON applications BEGIN
+                        INSERT INTO application_changes (application_id, user_id, operation)
+                        VALUES ({row}.id, {row}.user_id, '{operation}');
+                    END
+                ''')
+
+    def init_export_watermarks(self):
+        # The change log version each export target was last brought up to,
+        # so delta exports only read the changes after it
+        with self.transaction() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS export_watermarks (
+                    user_id TEXT NOT NULL,
+                    target TEXT NOT NULL,
+                    version INTEGER NOT NULL,
+                    exported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (user_id, target)
+                ) WITHOUT ROWID
+            ''')
+
+    def init_statistics(self):
+        # Dashboard counts kept up to date by triggers, so reading them costs a
+        # few rows however many applications there are. Buckets are the status,
+        # the Monday of the created_at week and the deadline epoch day
+        # ('' for applications without a deadline).
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            created = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='application_stats'"
+            ).fetchone() is None
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS application_stats (
+                    user_id TEXT NOT NULL,
+                    dimension TEXT NOT NULL,
+                    bucket NOT NULL,
+                    count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (user_id, dimension, bucket)
+                ) WITHOUT ROWID
+            ''')
+
+            def adjust(row, delta):
+                return ''.join(f'''
+                    INSERT INTO application_stats (user_id, dimension, bucket, count)
+                    VALUES ({row}.user_id, '{dimension}', {bucket.format(row=row)}, {delta})
+                    ON CONFLICT (user_id, dimension, bucket) DO UPDATE SET count = count + {delta};
+                ''' for dimension, bucket in STATISTICS_BUCKETS)
+
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS applications_stats_insert
+                AFTER INSERT ON applications BEGIN {adjust('new', 1)} END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS applications_stats_delete
+                AFTER DELETE ON applications BEGIN {adjust('old', -1)} END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS applications_stats_update
+                AFTER UPDATE OF status, deadline_day, created_at, user_id ON applications
+                BEGIN {adjust('old', -1)} {adjust('new', 1)} END
+            ''')
+
+            if created:
+                self._rebuild_statistics(cursor)
+
+    def _rebuild_statistics(self, cursor):
+        cursor.execute('DELETE FROM application_stats')
+        for dimension, bucket in STATISTICS_BUCKETS:
+            bucket = bucket.format(row='applications')
+            cursor.execute(f'''
+                INSERT INTO application_stats (user_id, dimension, bucket, count)
+                SELECT user_id, '{dimension}', {bucket}, COUNT(*)
+                FROM applications
+                GROUP BY user_id, {bucket}
+            ''')
+
+    def rebuild_statistics(self):
+        with self.transaction() as conn:
+            self._rebuild_statistics(conn.cursor())
+
+    def _rebuild_applications_table(self, cursor, columns):
+        # Older databases predate the timestamp and user columns. SQLite cannot
+        # add a column defaulting to CURRENT_TIMESTAMP, so copy into a fresh table.
+        copied = ', '.join(sorted(columns & {'id', 'company', 'role', 'status', 'deadline',
+                                             'notes', 'created_at', 'updated_at', 'user_id'}))
+        cursor.execute('DROP TABLE IF EXISTS applications_upgrade')
+        cursor.execute(APPLICATIONS_TABLE.format(table='applications_upgrade'))
+        cursor.execute(f'INSERT INTO applications_upgrade ({copied}) SELECT {copied} FROM applications')
+        cursor.execute('DROP TABLE applications')
+        cursor.execute('ALTER TABLE applications_upgrade RENAME TO applications')
+
+    def _backfill_deadline_days(self, cursor, recheck=False):
+        # recheck also repairs days filled in by an older parser, at the cost
+        # of parsing every deadline
+        where = ('deadline_day IS NOT ' + DEADLINE_DAY_SQL if recheck
+                 else 'deadline IS NOT NULL AND deadline_day IS NULL')
+        cursor.execute(f'''
+            UPDATE applications SET deadline_day = {DEADLINE_DAY_SQL}
+            WHERE {where}
+        ''')
+        return cursor.rowcount
+
+    def backfill_deadline_days(self, recheck=True):
+        with self.transaction() as conn:
+            return self._backfill_deadline_days(conn.cursor(), recheck)
+
+    def init_search_index(self):
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            exists = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='applications_fts'"
+            ).fetchone() is not None
+            try:
+                # External-content index: the text lives only in applications
+                cursor.execute('''
+                    CREATE VIRTUAL TABLE IF NOT EXISTS applications_fts USING fts5(
+                        company, role, notes,
+                        content='applications', content_rowid='id',
+                        prefix='2 3'
+                    )
+                ''')
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5, searches use LIKE instead
+                return False
+
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS applications_fts_insert AFTER INSERT ON applications BEGIN
+                    INSERT INTO applications_fts(rowid, company, role, notes)
+                    VALUES (new.id, new.company, new.role, new.notes);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS applications_fts_delete AFTER DELETE ON applications BEGIN
+                    INSERT INTO applications_fts(applications_fts, rowid, company, role, notes)
+                    VALUES ('delete', old.id, old.company, old.role, old.notes);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS applications_fts_update
+                AFTER UPDATE OF company, role, notes ON applications BEGIN
+                    INSERT INTO applications_fts(applications_fts, rowid, company, role, notes)
+                    VALUES ('delete', old.id, old.company, old.role, old.notes);
+                    INSERT INTO applications_fts(rowid, company, role, notes)
+                    VALUES (new.id, new.company, new.role, new.notes);
+                END
+            ''')
+
+        if not exists:
+            # Index rows written before the search index existed
+            self.rebuild_search_index(optimize=False)
+        return True
+
+    def rebuild_search_index(self, optimize=True):
+        if not getattr(self, 'fts_enabled', True):
+            return False
+        with self.transaction() as conn:
+            conn.execute("INSERT INTO applications_fts(applications_fts) VALUES ('rebuild')")
+            if optimize:
+                conn.execute("INSERT INTO applications_fts(applications_fts) VALUES ('optimize')")
+        return True
+
     def add_application(self, application):
-        with sqlite3.connect(self.db_name) as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute('''
-                INSERT INTO applications (company, role, status, deadline, notes)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (application.company, application.role, application.status, 
-                  application.deadline, application.notes))
-            conn.commit()
+                INSERT INTO applications (company, role, status, deadline, deadline_day, notes, user_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (application.company, application.role, application.status,
+                  _deadline_text(application.deadline), _deadline_day(application.deadline), application.notes, self.user_id))
             return cursor.lastrowid
-    
+
     def update_application(self, application):
-        with sqlite3.connect(self.db_name) as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute('''
-                UPDATE applications 
-                SET company=?, role=?, status=?, deadline=?, notes=?, updated_at=CURRENT_TIMESTAMP
-                WHERE id=?
-            ''', (application.company, application.role, application.status, 
-                  application.deadline, application.notes, application.id))
-            conn.commit()
-    
+                UPDATE applications
+                SET company=?, role=?, status=?, deadline=?, deadline_day=?, notes=?,
+                    updated_at=CURRENT_TIMESTAMP
+                WHERE id=? AND user_id=?
+            ''', (application.company, application.role, application.status,
+                  _deadline_text(application.deadline), _deadline_day(application.deadline), application.notes, application.id, self.user_id))
+
     def delete_application(self, application_id):
-        with sqlite3.connect(self.db_name) as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute('DELETE FROM applications WHERE id=?', (application_id,))
-            conn.commit()
-    
-    def get_all_applications(self):
-        with sqlite3.connect(self.db_name) as conn:
-            conn.row_factory = sqlite3.Row
+            cursor.execute('DELETE FROM applications WHERE id=? AND user_id=?',
+                           (application_id, self.user_id))
+
+    def add_applications_many(self, applications, chunk_size=1000):
+        ids = []
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT * FROM applications ORDER BY deadline')
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-    
-    def get_applications_by_status(self, status):
-        with sqlite3.connect(self.db_name) as conn:
-            conn.row_factory = sqlite3.Row
+            for chunk in _chunks(map(_as_application, applications), chunk_size):
+                cursor.executemany('''
+                    INSERT INTO applications (company, role, status, deadline, deadline_day, notes, user_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', [(app.company, app.role, app.status, _deadline_text(app.deadline), _deadline_day(app.deadline),
+                       app.notes, self.user_id)
+                      for app in chunk])
+                # The write lock is held for the whole transaction, so the
+                # AUTOINCREMENT ids of one executemany batch are consecutive
+                last_id = cursor.execute('SELECT last_insert_rowid()').fetchone()[0]
+                ids.extend(range(last_id - len(chunk) + 1, last_id + 1))
+        return ids
+
+    def update_applications_many(self, applications, chunk_size=1000):
+        updated = 0
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT * FROM applications WHERE status=? ORDER BY deadline', (status,))
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-    
-    def get_upcoming_deadlines(self, days=7):
-        with sqlite3.connect(self.db_name) as conn:
-            conn.row_factory = sqlite3.Row
+            for chunk in _chunks(map(_as_application, applications), chunk_size):
+                cursor.executemany('''
+                    UPDATE applications
+                    SET company=?, role=?, status=?, deadline=?, deadline_day=?, notes=?,
+                        updated_at=CURRENT_TIMESTAMP
+                    WHERE id=? AND user_id=?
+                ''', [(app.company, app.role, app.status, _deadline_text(app.deadline), _deadline_day(app.deadline),
+                       app.notes, app.id, self.user_id)
+                      for app in chunk])
+                updated += cursor.rowcount
+        return updated
+
+    def delete_applications_many(self, application_ids, chunk_size=500):
+        deleted = 0
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            today = datetime.now().strftime('%Y-%m-%d')
-            future_date = (datetime.now() + timedelta(days=days)).strftime('%Y-%m-%d')
-            cursor.execute('''
-                SELECT * FROM applications 
-                WHERE deadline BETWEEN ? AND ?
-                ORDER BY deadline
-            ''', (today, future_date))
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-    
-    def search_applications(self, search_term):
-        with sqlite3.connect(self.db_name) as conn:
-            conn.row_factory = sqlite3.Row
+            for chunk in _chunks(application_ids, chunk_size):
+                placeholders = ', '.join('?' * len(chunk))
+                cursor.execute(f'DELETE FROM applications WHERE id IN ({placeholders}) AND user_id=?',
+                               (*chunk, self.user_id))
+                deleted += cursor.rowcount
+        return deleted
+
+    def set_status_many(self, application_ids, status, chunk_size=500):
+        # One UPDATE per chunk of ids, all in a single transaction
+        updated = 0
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            search_pattern = f'%{search_term}%'
-            cursor.execute('''
-                SELECT * FROM applications 
-                WHERE company LIKE ? OR role LIKE ? OR notes LIKE ?
-                ORDER BY deadline
-            ''', (search_pattern, search_pattern, search_pattern))
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
\ No newline at end of file
+            for chunk in _chunks(application_ids, chunk_size):
+                placeholders = ', '.join('?' * len(chunk))
+                cursor.execute(f'''
+                    UPDATE applications SET status=?, updated_at=CURRENT_TIMESTAMP
+                    WHERE id IN ({placeholders}) AND user_id=? AND status != ?
+                ''', (status, *chunk, self.user_id, status))
+                updated += cursor.rowcount
+        return updated
+
+    def shift_deadlines_many(self, application_ids, days, chunk_size=500):
+        # Moves existing deadlines by a number of days; rows without a
+        # deadline are left alone. The text is rebuilt from the day number,
+        # since date() gives NULL for deadlines it can't parse.
+        updated = 0
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            for chunk in _chunks(application_ids, chunk_size):
+                placeholders = ', '.join('?' * len(chunk))
+                cursor.execute(f'''
+                    UPDATE applications
+                    SET deadline=date((deadline_day + ?) * 86400, 'unixepoch'), deadline_day=deadline_day + ?,
+                        updated_at=CURRENT_TIMESTAMP
+                    WHERE id IN ({placeholders}) AND user_id=? AND deadline_day IS NOT NULL
+                ''', (int(days), int(days), *chunk, self.user_id))
+                updated += cursor.rowcount
+        return updated
+
+    def get_application(self, application_id):
+        cursor = self.get_connection().cursor()
+        cursor.row_factory = JobApplication.from_row
+        cursor.execute(f'SELECT {APPLICATION_COLUMNS} FROM applications WHERE id=? AND user_id=?',
+                       (application_id, self.user_id))
+        return cursor.fetchone()
+
+    def get_applications(self, application_ids, chunk_size=500):
+        # Stay below SQLite's bound-parameter limit for large id lists
+        found = {}
+        cursor = self.get_connection().cursor()
+        cursor.row_factory = JobApplication.from_row
+        for chunk in _chunks(application_ids, chunk_size):
+            placeholders = ', '.join('?' * len(chunk))
+            cursor.execute(f'''
+                SELECT {APPLICATION_COLUMNS} FROM applications
+                WHERE id IN ({placeholders}) AND user_id=?
+            ''', (*chunk, self.user_id))
+            for app in cursor.fetchall():
+                found[app.id] = app
+        return [found[application_id] for application_id in application_ids
+                if application_id in found]
+
+    def get_all_applications(self, sort="deadline", descending=False):
+        return self._fetch_all(f'''
+            SELECT {APPLICATION_COLUMNS} FROM applications WHERE user_id=? ORDER BY {_order_by(sort, descending)}
+        ''', (self.user_id,))
+
+    def get_applications_by_status(self, status, sort="deadline", descending=False):
+        return self._fetch_all(f'''
+            SELECT {APPLICATION_COLUMNS} FROM applications WHERE user_id=? AND status=? ORDER BY {_order_by(sort, descending)}
+        ''', (self.user_id, status))
+
+    def get_upcoming_deadlines(self, days=7, sort="deadline", descending=False):
+        today = date.today().toordinal() - EPOCH_ORDINAL
+        return self._fetch_all(f'''
+            SELECT {APPLICATION_COLUMNS} FROM applications
+            WHERE user_id=? AND deadline_day BETWEEN ? AND ?
+            ORDER BY {_order_by(sort, descending)}
+        ''', (self.user_id, today, today + days))
+
+    def search_applications(self, search_term, ranked=True, sort=None, descending=False):
+        # Results are ranked by relevance unless a sort column is given
+        tokens = re.findall(r'\w+', search_term)
+        if self.fts_enabled and tokens:
+            match = _match_expression(tokens)
+            order = ('bm25(applications_fts), a.deadline_day' if ranked and sort is None
+                     else _order_by(sort or "deadline", descending, prefix='a.'))
+            return self._fetch_all(f'''
+                SELECT {JOINED_APPLICATION_COLUMNS} FROM applications_fts
+                JOIN applications a ON a.id = applications_fts.rowid
+                WHERE applications_fts MATCH ? AND a.user_id = ?
+                ORDER BY {order}
+            ''', (match, self.user_id))
+
+        search_pattern = f'%{search_term}%'
+        order = _order_by(sort or "deadline", descending)
+        return self._fetch_all(f'''
+            SELECT {APPLICATION_COLUMNS} FROM applications
+            WHERE user_id=? AND (company LIKE ? OR role LIKE ? OR notes LIKE ?)
+            ORDER BY {order}
+        ''', (self.user_id, search_pattern, search_pattern, search_pattern))
+
+    def _filter_clauses(self, status=None, search_term=None):
+        clauses, params = ['user_id = ?'], [self.user_id]
+        if status:
+            clauses.append('status = ?')
+            params.append(status)
+        if search_term:
+            tokens = re.findall(r'\w+', search_term)
+            if self.fts_enabled and tokens:
+                clauses.append('id IN (SELECT rowid FROM applications_fts WHERE applications_fts MATCH ?)')
+                params.append(_match_expression(tokens))
+            else:
+                search_pattern = f'%{search_term}%'
+                clauses.append('(company LIKE ? OR role LIKE ? OR notes LIKE ?)')
+                params.extend([search_pattern] * 3)
+        return clauses, params
+
+    def get_applications_page(self, status=None, search_term=None, page_size=100, token=None,
+                              sort="deadline", descending=False):
+        column = _sort_column(sort)
+        clauses, params = self._filter_clauses(status, search_term)
+        ranges = [(None, [])]
+        if token:
+            token_sort, token_descending, sort_value, row_id = _decode_token(token)
+            if (token_sort, token_descending) != (sort, bool(descending)):
+                raise ValueError(f"Continuation token was issued for a different sort: {token!r}")
+            ranges = _keyset_ranges(column, descending, sort_value, row_id)
+
+        # Fetch one extra row to know whether another page exists
+        rows = []
+        for clause, clause_params in ranges:
+            where = ' AND '.join(clauses + [clause] if clause else clauses)
+            rows += self._fetch_all(f'''
+                SELECT {APPLICATION_COLUMNS} FROM applications WHERE {where}
+                ORDER BY {_order_by(sort, descending)}
+                LIMIT ?
+            ''', (*params, *clause_params, page_size + 1 - len(rows)))
+            if len(rows) > page_size:
+                break
+
+        next_token = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]
+            next_token = _encode_token([sort, bool(descending), last[column], last["id"]])
+        return rows, next_token
+
+    def get_statistics(self, upcoming_days=7, weeks=12):
+        cursor = self.get_connection().cursor()
+        cursor.execute('''
+            SELECT bucket, count FROM application_stats
+            WHERE user_id=? AND dimension='status' AND count > 0
+            ORDER BY bucket
+        ''', (self.user_id,))
+        by_status = {row["bucket"]: row["count"] for row in cursor.fetchall()}
+
+        cursor.execute('''
+            SELECT bucket, count FROM application_stats
+            WHERE user_id=? AND dimension='week' AND count > 0
+            ORDER BY bucket DESC LIMIT ?
+        ''', (self.user_id, weeks))
+        by_week = [(row["bucket"], row["count"]) for row in reversed(cursor.fetchall())]
+
+        # Deadline buckets are epoch days; '' sorts after every integer
+        today = date.today().toordinal() - EPOCH_ORDINAL
+        cursor.execute('''
+            SELECT IFNULL(SUM(count), 0) FROM application_stats
+            WHERE user_id=? AND dimension='deadline' AND bucket BETWEEN ? AND ?
+        ''', (self.user_id, today, today + upcoming_days))
+        upcoming = cursor.fetchone()[0]
+
+        return {
+            "total": sum(by_status.values()),
+            "by_status": by_status,
+            "by_week": by_week,
+            "upcoming": upcoming,
+        }
+
+    def count_applications(self, status=None, search_term=None):
+        clauses, params = self._filter_clauses(status, search_term)
+        cursor = self.get_connection().cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM applications WHERE {' AND '.join(clauses)}", params)
+        return cursor.fetchone()[0]
+
+    def get_application_ids(self, status=None, search_term=None, sort="deadline", descending=False):
+        # Ids only, in display order, read straight from the covering index;
+        # a million ids take 8 MB, so callers can page rows by position
+        clauses, params = self._filter_clauses(status, search_term)
+        cursor = self.get_connection().cursor()
+        cursor.execute(f'''
+            SELECT id FROM applications WHERE {' AND '.join(clauses)}
+            ORDER BY {_order_by(sort, descending)}
+        ''', params)
+        ids = array.array('q')
+        while True:
+            rows = cursor.fetchmany(10000)
+            if not rows:
+                return ids
+            ids.extend(row[0] for row in rows)
+
+    def get_deadline_days(self, from_day):
+        # (id, deadline_day) pairs from the covering deadline index, for
+        # callers that only need to know when things are due
+        cursor = self.get_connection().cursor()
+        cursor.execute('''
+            SELECT id, deadline_day FROM applications
+            WHERE user_id=? AND deadline_day >= ?
+        ''', (self.user_id, from_day))
+        return [(row[0], row[1]) for row in cursor.fetchall()]
+
+    def get_change_version(self):
+        cursor = self.get_connection().cursor()
+        cursor.execute('SELECT MAX(version) FROM application_changes WHERE user_id=?', (self.user_id,))
+        return cursor.fetchone()[0] or 0
+
+    def get_changes_since(self, version=0):
+        # Collapse multiple changes to one application into its latest state:
+        # the current row, or a tombstone when it no longer exists
+        cursor = self.get_connection().cursor()
+        cursor.execute(f'''
+            SELECT c.version AS change_version, c.application_id, {JOINED_APPLICATION_COLUMNS}
+            FROM (
+                SELECT MAX(version) AS version, application_id
+                FROM application_changes
+                WHERE user_id=? AND version > ?
+                GROUP BY application_id
+            ) c
+            LEFT JOIN applications a ON a.id = c.application_id AND a.user_id = ?
+            ORDER BY c.version
+        ''', (self.user_id, version, self.user_id))
+
+        changes = []
+        latest = version
+        for row in cursor.fetchall():
+            row = dict(row)
+            change_version = row.pop("change_version")
+            application_id = row.pop("application_id")
+            deleted = row["id"] is None
+            changes.append({
+                "version": change_version,
+                "id": application_id,
+                "deleted": deleted,
+                "application": None if deleted else row,
+            })
+            latest = change_version
+        return changes, latest
+
+    def prune_changes(self, before_version):
+        with self.transaction() as conn:
+            cursor = conn.execute('DELETE FROM application_changes WHERE user_id=? AND version < ?',
+                                  (self.user_id, before_version))
+            # A watermark below before_version - 1 would now miss changes, so
+            # its target gets a full export next time
+            conn.execute('DELETE FROM export_watermarks WHERE user_id=? AND version < ?',
+                         (self.user_id, before_version - 1))
+            return cursor.rowcount
+
+    def get_export_watermark(self, target):
+        cursor = self.get_connection().cursor()
+        cursor.execute('SELECT version FROM export_watermarks WHERE user_id=? AND target=?',
+                       (self.user_id, target))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def set_export_watermark(self, target, version):
+        with self.transaction() as conn:
+            conn.execute('''
+                INSERT INTO export_watermarks (user_id, target, version) VALUES (?, ?, ?)
+                ON CONFLICT(user_id, target) DO UPDATE
+                SET version=excluded.version, exported_at=CURRENT_TIMESTAMP
+            ''', (self.user_id, target, version))
+
+    def clear_export_watermark(self, target):
+        with self.transaction() as conn:
+            conn.execute('DELETE FROM export_watermarks WHERE user_id=? AND target=?',
+                         (self.user_id, target))
+
+    def iter_applications(self, status=None, search_term=None, batch_size=500,
+                          sort="deadline", descending=False):
+        clauses, params = self._filter_clauses(status, search_term)
+        where = f"WHERE {' AND '.join(clauses)}"
+
+        # A dedicated cursor so other queries can run while the caller iterates
+        cursor = self.get_connection().cursor()
+        cursor.row_factory = JobApplication.from_row
+        cursor.execute(f'''
+            SELECT {APPLICATION_COLUMNS} FROM applications {where}
+            ORDER BY {_order_by(sort, descending)}
+        ''', params)
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
+
+def migrate_user_databases(shared_db_name="job_applications.db", directory="."):
+    # Fold every job_applications_{username}.db into one shared database.
+    # Users that already have rows in the shared file are skipped, so the
+    # migration can be re-run safely after adding new per-user files.
+    shared_path = os.path.abspath(os.path.join(directory, shared_db_name))
+    migrated = {}
+    with DatabaseManager(shared_path) as shared:
+        conn = shared.get_connection()
+        for filename in sorted(os.listdir(directory)):
+            path = os.path.abspath(os.path.join(directory, filename))
+            if (not filename.startswith("job_applications_") or not filename.endswith(".db")
+                    or path == shared_path):
+                continue
+
+            username = _user_from_filename(filename)
+            if conn.execute('SELECT 1 FROM applications WHERE user_id=? LIMIT 1',
+                            (username,)).fetchone():
+                migrated[username] = 0
+                continue
+
+            conn.execute('ATTACH DATABASE ? AS source', (path,))
+            try:
+                with shared.transaction():
+                    cursor = conn.execute(f'''
+                        INSERT INTO applications
+                            (company, role, status, deadline, deadline_day, notes,
+                             created_at, updated_at, user_id)
+                        SELECT company, role, status, deadline, {DEADLINE_DAY_SQL}, notes,
+                               created_at, updated_at, ?
+                        FROM source.applications
+                        ORDER BY id
+                    ''', (username,))
+                    migrated[username] = cursor.rowcount
+            finally:
+                conn.execute('DETACH DATABASE source')
+    return migrated
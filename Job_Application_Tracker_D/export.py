@@ -1,24 +1,420 @@
 import csv
-import pandas as pd
-from datetime import datetime
+import gzip
+import io
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import date, datetime
+from itertools import islice
+from operator import itemgetter
+
+# Large write buffer so the file sees a few big writes rather than one per row
+WRITE_BUFFER = 1 << 20
+
+# Rows per worksheet allowed by Excel, including the header row
+EXCEL_MAX_ROWS = 1048576
+
+# Columns imported back from Parquet files; ids are assigned on insert
+IMPORT_COLUMNS = ["company", "role", "status", "deadline", "notes"]
+
+# Columns written to user-facing exports; internal ones such as user_id and
+# deadline_day stay out of the files
+EXPORT_COLUMNS = ["id", "company", "role", "status", "deadline", "notes", "created_at", "updated_at"]
+
+# Delta files add a flag marking deleted applications
+DELTA_COLUMNS = [*EXPORT_COLUMNS, "deleted"]
+
+class ExportCancelled(Exception):
+    pass
+
+def _parse_date(value):
+    try:
+        return date.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+def _parse_timestamp(value):
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+def _arrow_schema():
+    # pyarrow is only needed for Parquet and Arrow files, so it is imported here
+    import pyarrow as pa
+    return pa.schema([
+        ("id", pa.int64()),
+        ("company", pa.string()),
+        ("role", pa.string()),
+        ("status", pa.dictionary(pa.int32(), pa.string())),
+        ("deadline", pa.date32()),
+        ("notes", pa.string()),
+        ("created_at", pa.timestamp("s")),
+        ("updated_at", pa.timestamp("s")),
+    ])
+
+def _record_batches(applications, schema, chunk_size, progress, cancel_event, total):
+    # Typed record batches built column by column from chunks of row dicts.
+    # Status codes are shared across batches, so each batch's dictionary
+    # only extends the previous one and can be written as a delta.
+    import pyarrow as pa
+    if total is None and hasattr(applications, "__len__"):
+        total = len(applications)
+    rows = iter(applications)
+    status_codes = {}
+    written = 0
+    while True:
+        if cancel_event is not None and cancel_event.is_set():
+            raise ExportCancelled()
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        codes = [status_codes.setdefault(row["status"], len(status_codes)) for row in chunk]
+        yield pa.record_batch([
+            pa.array([row["id"] for row in chunk], pa.int64()),
+            pa.array([row["company"] for row in chunk], pa.string()),
+            pa.array([row["role"] for row in chunk], pa.string()),
+            pa.DictionaryArray.from_arrays(pa.array(codes, pa.int32()),
+                                           pa.array(list(status_codes), pa.string())),
+            pa.array([_parse_date(row["deadline"]) for row in chunk], pa.date32()),
+            pa.array([row["notes"] for row in chunk], pa.string()),
+            pa.array([_parse_timestamp(row.get("created_at")) for row in chunk], pa.timestamp("s")),
+            pa.array([_parse_timestamp(row.get("updated_at")) for row in chunk], pa.timestamp("s")),
+        ], schema=schema)
+        written += len(chunk)
+        if progress is not None:
+            progress(written, written if total is None else total)
+
+@contextmanager
+def atomic_path(filename):
+    # Write to a temporary file next to the target and rename it into place
+    # only on success, so a cancelled or failed export never leaves a partial file
+    directory = os.path.dirname(os.path.abspath(filename))
+    suffix = os.path.splitext(filename)[1]
+    fd, temp_path = tempfile.mkstemp(prefix=".export-", suffix=suffix, dir=directory)
+    os.close(fd)
+    # mkstemp creates the file owner-only; keep the usual permissions
+    os.chmod(temp_path, os.stat(filename).st_mode if os.path.exists(filename) else 0o644)
+    try:
+        yield temp_path
+        os.replace(temp_path, filename)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+def _open_text(filename, mode="w", compress=False, compresslevel=6, **kwargs):
+    if compress:
+        # gzip.open defaults to binary; text needs an explicit "t"
+        if "b" not in mode and "t" not in mode:
+            mode += "t"
+        if "r" in mode:
+            return gzip.open(filename, mode, **kwargs)
+        return gzip.open(filename, mode, compresslevel=compresslevel, **kwargs)
+    return open(filename, mode, buffering=WRITE_BUFFER, **kwargs)
+
+@contextmanager
+def atomic_output(filename, mode="w", compress=False, compresslevel=6, **kwargs):
+    with atomic_path(filename) as temp_path:
+        with _open_text(temp_path, mode, compress, compresslevel, **kwargs) as handle:
+            yield handle
+
+def _column_values(columns):
+    # Picks columns from a row dict or JobApplication, always as a tuple
+    getter = itemgetter(*columns)
+    return getter if len(columns) > 1 else lambda row: (getter(row),)
+
+def _is_jsonl(filename):
+    return filename.lower().endswith((".jsonl", ".jsonl.gz"))
+
+def _delta_records(changes):
+    # Delta rows carry the export columns plus a deleted flag; deletion
+    # markers keep only their id
+    for change in changes:
+        application = change["application"] or {"id": change["id"]}
+        record = {column: application.get(column) for column in EXPORT_COLUMNS}
+        record["deleted"] = change["deleted"]
+        yield record
+
+def _csv_line(values):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue()
+
+def _csv_records(lines):
+    # Raw CSV records, joining the lines of quoted fields that contain line
+    # breaks; a record is complete once its quote characters pair up. The
+    # last record may have no line break, and gets one so rows written after
+    # it start on their own line
+    record = ""
+    for line in lines:
+        record += line
+        if record.count('"') % 2 == 0:
+            yield record if record.endswith("\n") else record + "\r\n"
+            record = ""
+    if record:
+        yield record if record.endswith("\n") else record + "\r\n"
+
+def _jsonl_id(line):
+    # to_jsonl lines start with the id, so most need no JSON parsing
+    prefix = '{"id": '
+    end = line.find(",", len(prefix))
+    if line.startswith(prefix) and end != -1:
+        try:
+            return int(line[len(prefix):end])
+        except ValueError:
+            pass
+    return json.loads(line)["id"]
+
+def _merge_rows(rows, row_id, pending, render, cancel_event, chunk_size):
+    # Copies an existing export's records unchanged, replacing or dropping
+    # each one in pending as it is reached; records left in pending are new
+    # and appended at the end
+    for index, row in enumerate(rows):
+        if index % chunk_size == 0 and cancel_event is not None and cancel_event.is_set():
+            raise ExportCancelled()
+        application_id = row_id(row)
+        if application_id not in pending:
+            yield row
+            continue
+        application = pending.pop(application_id)
+        if application is not None:
+            yield render(application)
+    for application in pending.values():
+        if application is not None:
+            yield render(application)
 
 class ExportManager:
     @staticmethod
-    def to_csv(applications, filename=None):
+    def to_csv(applications, filename=None, progress=None, cancel_event=None, chunk_size=5000,
+               total=None, compress=None, columns=EXPORT_COLUMNS):
+        # applications is any iterable of row dicts, such as
+        # DatabaseManager.iter_applications(), which reads with fetchmany.
+        # Rows are written one chunk at a time, so memory stays constant
+        # however many there are. Only columns are written. Output is
+        # gzipped for .gz filenames or when compress is set.
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"job_applications_{timestamp}.csv"
-        
-        df = pd.DataFrame(applications)
-        df.to_csv(filename, index=False)
+            filename = f"job_applications_{timestamp}.csv" + (".gz" if compress else "")
+        if compress is None:
+            compress = filename.endswith(".gz")
+        if total is None and hasattr(applications, "__len__"):
+            total = len(applications)
+
+        rows = iter(applications)
+        values = _column_values(columns)
+        written = 0
+        with atomic_output(filename, newline="", encoding="utf-8", compress=compress) as handle:
+            writer = csv.writer(handle)
+            writer.writerow(columns)
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ExportCancelled(filename)
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                writer.writerows([values(row) for row in chunk])
+                written += len(chunk)
+                if progress is not None:
+                    progress(written, written if total is None else total)
         return filename
-    
+
     @staticmethod
-    def to_excel(applications, filename=None):
+    def to_jsonl(applications, filename=None, progress=None, cancel_event=None, chunk_size=5000,
+                 total=None, compress=None, columns=EXPORT_COLUMNS):
+        # Same input and compression rules as to_csv, one JSON object per line
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"job_applications_{timestamp}.jsonl" + (".gz" if compress else "")
+        if compress is None:
+            compress = filename.endswith(".gz")
+        if total is None and hasattr(applications, "__len__"):
+            total = len(applications)
+
+        rows = iter(applications)
+        values = _column_values(columns)
+        written = 0
+        with atomic_output(filename, encoding="utf-8", compress=compress) as handle:
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ExportCancelled(filename)
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                handle.writelines([json.dumps(dict(zip(columns, values(row)))) + "\n" for row in chunk])
+                written += len(chunk)
+                if progress is not None:
+                    progress(written, written if total is None else total)
+        return filename
+
+    @staticmethod
+    def to_excel(applications, filename=None, progress=None, cancel_event=None, chunk_size=5000,
+                 total=None, max_rows=EXCEL_MAX_ROWS, columns=EXPORT_COLUMNS):
+        # Same input as to_csv. A write-only workbook streams each row to a
+        # temporary file as it is appended instead of keeping cells in memory,
+        # and a new sheet is started whenever one reaches max_rows.
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"job_applications_{timestamp}.xlsx"
-        
-        df = pd.DataFrame(applications)
-        df.to_excel(filename, index=False)
-        return filename
\ No newline at end of file
+        if total is None and hasattr(applications, "__len__"):
+            total = len(applications)
+
+        # openpyxl is only needed for Excel exports, so it is imported here
+        from openpyxl import Workbook
+        workbook = Workbook(write_only=True)
+        rows = iter(applications)
+        values = _column_values(columns)
+        written = 0
+        sheet = None
+        sheet_rows = 0
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                raise ExportCancelled(filename)
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            for row in chunk:
+                if sheet is None or sheet_rows >= max_rows:
+                    title = "Applications" if sheet is None else f"Applications {len(workbook.worksheets) + 1}"
+                    sheet = workbook.create_sheet(title)
+                    sheet.append(list(columns))
+                    sheet_rows = 1
+                sheet.append(list(values(row)))
+                sheet_rows += 1
+            written += len(chunk)
+            if progress is not None:
+                progress(written, written if total is None else total)
+
+        if sheet is None:
+            workbook.create_sheet("Applications")
+        with atomic_path(filename) as temp_path:
+            workbook.save(temp_path)
+        return filename
+
+    @staticmethod
+    def to_parquet(applications, filename=None, progress=None, cancel_event=None, chunk_size=50000,
+                   total=None, compression="zstd", compression_level=None):
+        # Each chunk of rows becomes one typed record batch and row group
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"job_applications_{timestamp}.parquet"
+
+        import pyarrow.parquet as pq
+        schema = _arrow_schema()
+        with atomic_path(filename) as temp_path:
+            with pq.ParquetWriter(temp_path, schema, compression=compression,
+                                  compression_level=compression_level) as writer:
+                for batch in _record_batches(applications, schema, chunk_size, progress, cancel_event, total):
+                    writer.write_batch(batch)
+        return filename
+
+    @staticmethod
+    def to_arrow(applications, filename=None, progress=None, cancel_event=None, chunk_size=50000,
+                 total=None, compression="zstd"):
+        # Arrow IPC file; compression is "zstd", "lz4" or None
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"job_applications_{timestamp}.arrow"
+
+        import pyarrow as pa
+        schema = _arrow_schema()
+        options = pa.ipc.IpcWriteOptions(compression=compression, emit_dictionary_deltas=True)
+        with atomic_path(filename) as temp_path:
+            with pa.ipc.new_file(temp_path, schema, options=options) as writer:
+                for batch in _record_batches(applications, schema, chunk_size, progress, cancel_event, total):
+                    writer.write_batch(batch)
+        return filename
+
+    @staticmethod
+    def export_delta(db, filename, merge=False, progress=None, cancel_event=None, chunk_size=5000):
+        # Exports only what changed in db since the last export to filename.
+        # The change log version reached is stored as that target's watermark
+        # once the file is in place. Without merge, filename is overwritten
+        # with the changed rows plus deletion markers; with merge, the changes
+        # are applied to the CSV or JSONL export already at filename. With no
+        # watermark yet, or no file to merge into, every row is exported. The
+        # format follows the extension (.csv or .jsonl, optionally .gz).
+        target = os.path.abspath(filename)
+        compress = filename.endswith(".gz")
+        jsonl = _is_jsonl(filename)
+        watermark = db.get_export_watermark(target)
+
+        if watermark is None or (merge and not os.path.exists(filename)):
+            # Read the version first: rows changed during the export are
+            # exported again next time, which merging makes harmless
+            version = db.get_change_version()
+            total = db.count_applications()
+            applications = db.iter_applications(batch_size=chunk_size, sort="id")
+            columns = EXPORT_COLUMNS
+            if not merge:
+                applications = ({**dict(row), "deleted": False} for row in applications)
+                columns = DELTA_COLUMNS
+            export = ExportManager.to_jsonl if jsonl else ExportManager.to_csv
+            export(applications, filename, progress=progress, cancel_event=cancel_event,
+                   chunk_size=chunk_size, total=total, compress=compress, columns=columns)
+            db.set_export_watermark(target, version)
+            return {"full": True, "changed": total, "deleted": 0, "version": version}
+
+        changes, version = db.get_changes_since(watermark)
+        deleted = sum(1 for change in changes if change["deleted"])
+        if not merge:
+            export = ExportManager.to_jsonl if jsonl else ExportManager.to_csv
+            export(_delta_records(changes), filename, progress=progress, cancel_event=cancel_event,
+                   chunk_size=chunk_size, total=len(changes), compress=compress, columns=DELTA_COLUMNS)
+        elif changes:
+            pending = {change["id"]: change["application"] for change in changes}
+            newline = None if jsonl else ""
+            # The old file is read while the merged copy is written beside it,
+            # and closed before the copy replaces it
+            with atomic_path(filename) as temp_path:
+                with _open_text(filename, "r", compress, encoding="utf-8", newline=newline) as source, \
+                        _open_text(temp_path, "w", compress, encoding="utf-8", newline=newline) as handle:
+                    if jsonl:
+                        records = (line if line.endswith("\n") else line + "\n"
+                                   for line in source if line.strip())
+                        row_id = _jsonl_id
+
+                        def render(application):
+                            return json.dumps({column: application.get(column)
+                                               for column in EXPORT_COLUMNS}) + "\n"
+                    else:
+                        records = _csv_records(source)
+                        header_line = next(records, None)
+                        header = next(csv.reader([header_line])) if header_line else EXPORT_COLUMNS
+                        handle.write(_csv_line(header))
+                        id_index = header.index("id")
+
+                        def row_id(record):
+                            if id_index == 0 and not record.startswith('"'):
+                                return int(record[:record.index(",")])
+                            return int(next(csv.reader([record]))[id_index])
+
+                        def render(application):
+                            return _csv_line([application.get(column) for column in header])
+                    handle.writelines(_merge_rows(records, row_id, pending, render,
+                                                  cancel_event, chunk_size))
+            if progress is not None:
+                progress(len(changes), len(changes))
+
+        db.set_export_watermark(target, version)
+        return {"full": False, "changed": len(changes) - deleted, "deleted": deleted, "version": version}
+
+    @staticmethod
+    def from_parquet(filename, db, batch_size=50000, progress=None):
+        # Bulk-loads a Parquet export into db, one transaction per batch.
+        # Imported rows get new ids.
+        import pyarrow.parquet as pq
+        parquet = pq.ParquetFile(filename)
+        total = parquet.metadata.num_rows
+        imported = 0
+        for batch in parquet.iter_batches(batch_size=batch_size, columns=IMPORT_COLUMNS):
+            rows = batch.to_pylist()
+            for row in rows:
+                if row["deadline"] is not None:
+                    row["deadline"] = row["deadline"].isoformat()
+            db.add_applications_many(rows, chunk_size=batch_size)
+            imported += len(rows)
+            if progress is not None:
+                progress(imported, total)
+        return imported
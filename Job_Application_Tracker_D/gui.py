@@ -1,22 +1,249 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
+import threading
+import time
+from tkinter import ttk, messagebox, filedialog, simpledialog
 from datetime import datetime, timedelta
 from models import JobApplication
 from database import DatabaseManager
-from export import ExportManager
+from async_database import AsyncDatabaseManager
+from columnar_index import ApplicationIndex
+from export import ExportManager, ExportCancelled
+from reminders import DeadlineReminders
+
+def longest_ordered_subset(items, position):
+    # Longest subsequence of items whose positions are increasing (patience sort)
+    tails, links = [], {}
+    for item in items:
+        low, high = 0, len(tails)
+        while low < high:
+            middle = (low + high) // 2
+            if position[tails[middle]] < position[item]:
+                low = middle + 1
+            else:
+                high = middle
+        links[item] = tails[low - 1] if low else None
+        if low == len(tails):
+            tails.append(item)
+        else:
+            tails[low] = item
+    
+    result = set()
+    item = tails[-1] if tails else None
+    while item is not None:
+        result.add(item)
+        item = links[item]
+    return result
+
+# Treeview headings that can be sorted, and the database sort key for each
+SORTABLE_HEADINGS = {
+    "ID": "id",
+    "Company": "company",
+    "Role": "role",
+    "Status": "status",
+    "Deadline": "deadline",
+}
+
+# Above this many applications the Treeview only holds the visible rows
+VIRTUAL_LIST_THRESHOLD = 10000
+# The in-memory index is built when the tracker opens, so it is only used
+# while that stays quick
+IN_MEMORY_INDEX_LIMIT = 50000
+
+class VirtualApplicationList:
+    def __init__(self, tree, scrollbar, db, render, overscan=20):
+        # Only the rows inside the visible window exist as Treeview items; the
+        # ordered id list is kept instead and rows are fetched by position
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.db = db
+        self.render = render
+        self.overscan = overscan
+        self.ids = []
+        self.rows = {}
+        self.first = 0
+        # Selected application ids, kept while their rows are scrolled out
+        # of the window and their Treeview items deleted
+        self.selected = set()
+        
+        self.tree.configure(yscrollcommand="")
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.tree.bind("<Button-1>", self.on_click)
+        self.scrollbar.configure(command=self.on_scroll)
+        self.tree.bind("<Configure>", lambda event: self.refresh())
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_by(3))
+        self.tree.bind("<Prior>", lambda event: self.scroll_by(-self.visible_count()))
+        self.tree.bind("<Next>", lambda event: self.scroll_by(self.visible_count()))
+    
+    def set_ids(self, ids, keep_position=True):
+        # Refreshes keep the scroll position; new filters start at the top
+        self.ids = ids
+        self.rows = {}
+        self.keep_selected()
+        if not keep_position:
+            self.first = 0
+        self.refresh()
+    
+    def set_rows(self, applications):
+        self.ids = [app["id"] for app in applications]
+        self.rows = {app["id"]: app for app in applications}
+        self.keep_selected()
+        self.first = 0
+        self.refresh()
+    
+    def keep_selected(self):
+        # Rows that left the list can no longer be acted on
+        if self.selected:
+            self.selected &= set(self.ids)
+    
+    def on_click(self, event):
+        # A plain click starts a new selection; Shift and Control extend it
+        if not event.state & 0x5:
+            self.selected.clear()
+    
+    def on_select(self, event=None):
+        # Only rows that currently have items can change selection here
+        present = set(self.tree.get_children())
+        self.selected = {row_id for row_id in self.selected if str(row_id) not in present}
+        self.selected.update(int(iid) for iid in self.tree.selection())
+    
+    def visible_count(self):
+        style = ttk.Style(self.tree)
+        row_height = int(style.lookup("Treeview", "rowheight") or 20)
+        # One row's worth of height goes to the headings
+        return max(1, self.tree.winfo_height() // row_height - 1)
+    
+    def refresh(self):
+        count = self.visible_count()
+        self.first = max(0, min(self.first, len(self.ids) - count))
+        last = min(len(self.ids), self.first + count)
+        
+        # Fetch the visible window plus overscan on both sides, so small
+        # scrolls are served from memory
+        missing = [row_id for row_id in self.ids[self.first:last] if row_id not in self.rows]
+        if missing:
+            start = max(0, self.first - self.overscan)
+            end = min(len(self.ids), last + self.overscan)
+            window = set(self.ids[start:end])
+            self.rows = {row_id: row for row_id, row in self.rows.items() if row_id in window}
+            wanted = [row_id for row_id in self.ids[start:end] if row_id not in self.rows]
+            for app in self.db.get_applications(wanted):
+                self.rows[app.id] = app
+        
+        self.render([self.rows[row_id] for row_id in self.ids[self.first:last] if row_id in self.rows])
+        # Re-created items start unselected
+        self.tree.selection_set([str(row_id) for row_id in self.ids[self.first:last] if row_id in self.selected])
+        if self.ids:
+            self.scrollbar.set(self.first / len(self.ids), last / len(self.ids))
+        else:
+            self.scrollbar.set(0, 1)
+    
+    def scroll_by(self, rows):
+        self.first += rows
+        self.refresh()
+        return "break"
+    
+    def on_mousewheel(self, event):
+        return self.scroll_by(-3 if event.delta > 0 else 3)
+    
+    def on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self.first = int(float(amount) * len(self.ids))
+            self.refresh()
+        elif unit == "pages":
+            self.scroll_by(int(amount) * self.visible_count())
+        else:
+            self.scroll_by(int(amount))
+
+class DashboardPanel:
+    def __init__(self, parent, async_db, statuses, upcoming_days=7, weeks=12):
+        # Shows the trigger-maintained summary counts, so refreshing costs the
+        # same however many applications there are
+        self.async_db = async_db
+        self.statuses = statuses
+        self.upcoming_days = upcoming_days
+        self.weeks = weeks
+        
+        self.frame = ttk.LabelFrame(parent, text="Dashboard", padding="5")
+        counts_frame = ttk.Frame(self.frame)
+        counts_frame.pack(side=tk.LEFT, fill=tk.Y)
+        
+        self.count_vars = {}
+        for label in ["Total"] + statuses + [f"Due in {upcoming_days} days"]:
+            var = tk.StringVar(value="0")
+            self.count_vars[label] = var
+            cell = ttk.Frame(counts_frame)
+            cell.pack(side=tk.LEFT, padx=(0, 15))
+            ttk.Label(cell, text=label).pack()
+            ttk.Label(cell, textvariable=var, font=("TkDefaultFont", 12, "bold")).pack()
+        
+        # Applications created per week, oldest on the left
+        self.chart = tk.Canvas(self.frame, width=weeks * 18, height=50, highlightthickness=0)
+        self.chart.pack(side=tk.RIGHT)
+    
+    def refresh(self):
+        self.async_db.submit("get_statistics", upcoming_days=self.upcoming_days, weeks=self.weeks,
+                             key="dashboard", callback=self.show)
+    
+    def show(self, stats):
+        self.count_vars["Total"].set(stats["total"])
+        for status in self.statuses:
+            self.count_vars[status].set(stats["by_status"].get(status, 0))
+        self.count_vars[f"Due in {self.upcoming_days} days"].set(stats["upcoming"])
+        
+        self.chart.delete("all")
+        height = int(self.chart["height"])
+        peak = max((count for _, count in stats["by_week"]), default=0)
+        for index, (week, count) in enumerate(stats["by_week"]):
+            bar = max(1, round((height - 2) * count / peak))
+            left = index * 18 + 2
+            item = self.chart.create_rectangle(left, height - bar, left + 14, height, fill="#4a7abc", outline="")
+            self.chart.tag_bind(item, "<Enter>", lambda event, week=week, count=count:
+                                self.chart.itemconfigure("label", text=f"Week of {week}: {count}"))
+        self.chart.create_text(2, 0, anchor=tk.NW, tags="label", text="Created per week")
 
 class JobApplicationTracker:
-    def __init__(self, root, username):
+    def __init__(self, root, username, shared_db=False, virtual_list=None, in_memory_index=None):
         self.root = root
         self.username = username
         self.root.title(f"Job Application Tracker - {username}")
         self.root.geometry("1000x600")
         
-        self.db = DatabaseManager(username=username)
+        self.db = DatabaseManager(username=username, shared=shared_db)
+        self.async_db = AsyncDatabaseManager(self.db, root=self.root)
         self.export_manager = ExportManager()
         
+        # Keystrokes within this many milliseconds are coalesced into one search
+        self.search_delay = 250
+        self.search_job = None
+        
+        # Sort order is applied by the database (or the in-memory index) and
+        # kept across refreshes, searches and filters
+        self.sort_column = "deadline"
+        self.sort_descending = False
+        
+        # Modes left as None are chosen from the number of applications
+        if virtual_list is None or in_memory_index is None:
+            count = self.db.count_applications()
+            if virtual_list is None:
+                virtual_list = count > VIRTUAL_LIST_THRESHOLD
+            if in_memory_index is None:
+                in_memory_index = count <= IN_MEMORY_INDEX_LIMIT
+        
+        self.use_virtual_list = virtual_list
+        self.virtual_list = None
+        
+        # Optional in-memory snapshot that answers filter + search together
+        self.app_index = ApplicationIndex(self.db) if in_memory_index else None
+        
         self.setup_ui()
         self.load_applications()
+        self.dashboard.refresh()
+        
+        # Reminders fire from a single timer set for the next deadline
+        self.reminders = DeadlineReminders(self.root, self.db, self.on_deadline_reminder)
+        self.start_reminders()
     
     def setup_ui(self):
         # Main frame
@@ -33,6 +260,9 @@ class JobApplicationTracker:
         search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=30)
         search_entry.pack(side=tk.LEFT, padx=(0, 10))
         
+        self.search_status_var = tk.StringVar()
+        ttk.Label(search_frame, textvariable=self.search_status_var, width=22).pack(side=tk.LEFT, padx=(0, 10))
+        
         ttk.Label(search_frame, text="Filter by Status:").pack(side=tk.LEFT, padx=(0, 5))
         self.status_filter_var = tk.StringVar(value="All")
         status_combo = ttk.Combobox(search_frame, textvariable=self.status_filter_var, 
@@ -43,17 +273,27 @@ class JobApplicationTracker:
         ttk.Button(search_frame, text="Upcoming Deadlines", 
                   command=self.show_upcoming_deadlines).pack(side=tk.LEFT, padx=(10, 0))
         
+        # Summary counts above the list
+        self.dashboard = DashboardPanel(main_frame, self.async_db, ["Applied", "Interview", "Offer", "Rejected", "No Response"])
+        self.dashboard.frame.pack(fill=tk.X, pady=(0, 10))
+        
         # Applications treeview with scrollbar
         tree_frame = ttk.Frame(main_frame)
         tree_frame.pack(fill=tk.BOTH, expand=True)
         
         columns = ("ID", "Company", "Role", "Status", "Deadline", "Notes")
-        self.tree = ttk.Treeview(tree_frame, columns=columns, show="headings", selectmode="browse")
+        self.tree = ttk.Treeview(tree_frame, columns=columns, show="headings", selectmode="extended")
+        # Mirror of the Treeview contents used to diff refreshes
+        self.tree_order = []
+        self.tree_values = {}
         
-        # Define headings
+        # Define headings; clicking a sortable heading sorts by it
         for col in columns:
             self.tree.heading(col, text=col)
             self.tree.column(col, width=100, anchor=tk.W)
+            if col in SORTABLE_HEADINGS:
+                self.tree.heading(col, command=lambda col=col: self.sort_by(SORTABLE_HEADINGS[col]))
+        self.update_sort_headings()
         
         self.tree.column("ID", width=50)
         self.tree.column("Company", width=150)
@@ -69,6 +309,10 @@ class JobApplicationTracker:
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # For very large databases only the visible rows are materialized
+        if self.use_virtual_list:
+            self.virtual_list = VirtualApplicationList(self.tree, scrollbar, self.db, self.render_rows)
+        
         # Bind double click to edit
         self.tree.bind("<Double-1>", self.on_double_click)
         
@@ -79,108 +323,405 @@ class JobApplicationTracker:
         ttk.Button(button_frame, text="Add Application", command=self.add_application).pack(side=tk.LEFT, padx=(0, 10))
         ttk.Button(button_frame, text="Edit Application", command=self.edit_application).pack(side=tk.LEFT, padx=(0, 10))
         ttk.Button(button_frame, text="Delete Application", command=self.delete_application).pack(side=tk.LEFT, padx=(0, 10))
-        ttk.Button(button_frame, text="Export to CSV", command=self.export_to_csv).pack(side=tk.LEFT)
+        ttk.Button(button_frame, text="Change Status", command=self.change_status).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(button_frame, text="Shift Deadlines", command=self.shift_deadlines).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(button_frame, text="Export to CSV", command=self.export_to_csv).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(button_frame, text="Export to Excel", command=self.export_to_excel).pack(side=tk.LEFT)
     
     def load_applications(self, applications=None):
-        if applications is None:
-            applications = self.db.get_all_applications()
-        
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Add applications to treeview
-        for app in applications:
-            self.tree.insert("", "end", values=(
-                app["id"],
-                app["company"],
-                app["role"],
-                app["status"],
-                app["deadline"] or "",
-                app["notes"] or ""
-            ))
+        if applications is None and self.app_index is not None:
+            self.show_indexed_view()
+            return
+        
+        # Reads run on the async reader threads; a newer view request
+        # supersedes any still in flight
+        if self.virtual_list is not None:
+            if applications is None:
+                self.async_db.submit("get_application_ids", key="view", **self.sort_options(),
+                                     callback=self.virtual_list.set_ids)
+            else:
+                self.virtual_list.set_rows(applications)
+        elif applications is None:
+            self.async_db.submit("get_all_applications", key="view", **self.sort_options(),
+                                 callback=self.render_rows)
+        else:
+            self.render_rows(applications)
+    
+    def sort_options(self):
+        return {"sort": self.sort_column, "descending": self.sort_descending}
+    
+    def sort_by(self, column):
+        # Clicking the current sort column again reverses it
+        if column == self.sort_column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = column
+            self.sort_descending = False
+        self.update_sort_headings()
+        self.refresh_view()
+    
+    def update_sort_headings(self):
+        for heading, column in SORTABLE_HEADINGS.items():
+            arrow = (" \u25bc" if self.sort_descending else " \u25b2") if column == self.sort_column else ""
+            self.tree.heading(heading, text=heading + arrow)
+    
+    def refresh_view(self):
+        # Re-run whatever the list currently shows: a search or a status filter
+        if self.search_var.get():
+            self.run_search()
+        else:
+            self.on_filter()
+    
+    def show_indexed_view(self, keep_position=True):
+        # Bring the snapshot up to date from the change log, then evaluate the
+        # status filter and the search text together in memory
+        def show():
+            status = self.status_filter_var.get()
+            ids = self.app_index.query(status=None if status == "All" else status,
+                                       search_term=self.search_var.get(), **self.sort_options())
+            if self.virtual_list is not None:
+                self.virtual_list.set_ids(ids, keep_position=keep_position)
+            else:
+                self.async_db.submit("get_applications", ids, key="view", callback=self.render_rows)
+        self.read_changes(self.app_index, "index", then=show)
+    
+    def read_changes(self, consumer, key, then=None):
+        # Reads the change log off the Tk thread for the index or the
+        # reminders; a result read from a version consumer has since moved
+        # past is dropped
+        since = consumer.version
+        def apply(result):
+            if consumer.version == since:
+                consumer.apply(*result)
+            if then is not None:
+                then()
+        self.async_db.submit("get_changes_since", since, key=key, callback=apply)
+    
+    def render_rows(self, applications):
+        # Items are keyed by application id, so only rows that were added,
+        # changed, moved or removed touch the Treeview
+        rows = [(str(app["id"]), (
+            app["id"],
+            app["company"],
+            app["role"],
+            app["status"],
+            app["deadline"] or "",
+            app["notes"] or ""
+        )) for app in applications]
+        wanted = {iid for iid, _ in rows}
+        
+        removed = [iid for iid in self.tree_order if iid not in wanted]
+        if removed:
+            self.tree.delete(*removed)
+            for iid in removed:
+                del self.tree_values[iid]
+        
+        # Items already in the right relative order stay put; the rest are
+        # detached and re-attached at their new index
+        position = {iid: index for index, iid in enumerate(self.tree_order) if iid in wanted}
+        stable = longest_ordered_subset([iid for iid, _ in rows if iid in position], position)
+        moved = [iid for iid in position if iid not in stable]
+        if moved:
+            self.tree.detach(*moved)
+        
+        for index, (iid, values) in enumerate(rows):
+            current = self.tree_values.get(iid)
+            if current is None:
+                self.tree.insert("", index, iid=iid, values=values)
+            else:
+                if current != values:
+                    self.tree.item(iid, values=values)
+                if iid not in stable:
+                    self.tree.move(iid, "", index)
+            self.tree_values[iid] = values
+        self.tree_order = [iid for iid, _ in rows]
     
     def on_search(self, *args):
+        # Restart the debounce timer on every keystroke
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(self.search_delay, self.run_search)
+    
+    def run_search(self):
+        self.search_job = None
+        if self.app_index is not None:
+            self.show_indexed_view(keep_position=False)
+            return
+        
         search_term = self.search_var.get().lower()
         if not search_term:
+            self.search_status_var.set("")
             self.load_applications()
             return
         
-        filtered_apps = self.db.search_applications(search_term)
-        self.load_applications(filtered_apps)
+        started = time.perf_counter()
+        self.search_status_var.set("Searching...")
+        # The virtual list only needs the matching ids, in display order
+        method = "get_application_ids" if self.virtual_list is not None else "search_applications"
+        self.async_db.submit(
+            method, search_term=search_term, key="view", **self.sort_options(),
+            callback=lambda results: self.on_search_results(search_term, started, results),
+            errback=self.on_search_error
+        )
+    
+    def on_search_results(self, search_term, started, results):
+        # Results for text the user has since changed are stale
+        if search_term != self.search_var.get().lower():
+            return
+        elapsed = (time.perf_counter() - started) * 1000
+        self.search_status_var.set(f"{len(results)} results in {elapsed:.0f} ms")
+        if self.virtual_list is not None:
+            self.virtual_list.set_ids(results, keep_position=False)
+        else:
+            self.load_applications(results)
+    
+    def on_search_error(self, error):
+        self.search_status_var.set("")
+        messagebox.showerror("Search Failed", str(error))
     
     def on_filter(self, event=None):
         status = self.status_filter_var.get()
-        if status == "All":
+        if self.app_index is not None:
+            self.show_indexed_view(keep_position=False)
+        elif self.virtual_list is not None:
+            status = None if status == "All" else status
+            self.async_db.submit("get_application_ids", status=status, key="view", **self.sort_options(),
+                                 callback=lambda ids: self.virtual_list.set_ids(ids, keep_position=False))
+        elif status == "All":
             self.load_applications()
         else:
-            filtered_apps = self.db.get_applications_by_status(status)
-            self.load_applications(filtered_apps)
+            self.async_db.submit("get_applications_by_status", status, key="view", **self.sort_options(),
+                                 callback=self.load_applications)
     
     def show_upcoming_deadlines(self):
-        upcoming = self.db.get_upcoming_deadlines(7)  # Next 7 days
+        self.async_db.submit("get_upcoming_deadlines", 7, key="view", **self.sort_options(),  # Next 7 days
+                             callback=self.show_upcoming)
+    
+    def show_upcoming(self, upcoming):
         if not upcoming:
             messagebox.showinfo("Upcoming Deadlines", "No upcoming deadlines in the next 7 days.")
         else:
             self.load_applications(upcoming)
     
+    def on_deadline_reminder(self, applications):
+        if not applications:
+            return
+        lines = [f"{app.company} - {app.role}: due {app.deadline}" for app in applications]
+        self.root.bell()
+        messagebox.showinfo("Deadline Reminder", "\n".join(lines))
+    
+    def close(self):
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+            self.search_job = None
+        self.reminders.stop()
+        self.async_db.close()
+    
     def add_application(self):
         self.open_application_form()
     
     def edit_application(self):
-        selected = self.tree.selection()
-        if not selected:
+        app_ids = self.selected_ids()
+        if not app_ids:
             messagebox.showwarning("No Selection", "Please select an application to edit.")
             return
         
-        item = self.tree.item(selected[0])
-        app_id = item["values"][0]
-        self.open_application_form(app_id)
+        self.open_application_form(app_ids[0])
     
     def on_double_click(self, event):
         self.edit_application()
     
+    def selected_ids(self):
+        # Item ids are the application ids; the virtual list also remembers
+        # selected rows that are scrolled out of view
+        if self.virtual_list is not None:
+            return [app_id for app_id in self.virtual_list.ids if app_id in self.virtual_list.selected]
+        return [int(iid) for iid in self.tree.selection()]
+    
     def delete_application(self):
-        selected = self.tree.selection()
-        if not selected:
+        app_ids = self.selected_ids()
+        if not app_ids:
             messagebox.showwarning("No Selection", "Please select an application to delete.")
             return
         
-        if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this application?"):
-            item = self.tree.item(selected[0])
-            app_id = item["values"][0]
-            self.db.delete_application(app_id)
-            self.load_applications()
+        if len(app_ids) == 1:
+            question = "Are you sure you want to delete this application?"
+        else:
+            question = f"Are you sure you want to delete these {len(app_ids)} applications?"
+        if messagebox.askyesno("Confirm Delete", question):
+            self.submit_write("delete_applications_many", app_ids)
     
-    def open_application_form(self, app_id=None):
-        form = ApplicationForm(self.root, self.db, app_id)
-        self.root.wait_window(form.top)
+    def change_status(self):
+        app_ids = self.selected_ids()
+        if not app_ids:
+            messagebox.showwarning("No Selection", "Please select the applications to update.")
+            return
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Change Status")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        ttk.Label(dialog, text=f"New status for {len(app_ids)} selected:").pack(padx=20, pady=(15, 5))
+        status_var = tk.StringVar(value="Applied")
+        ttk.Combobox(dialog, textvariable=status_var, state="readonly",
+                     values=["Applied", "Interview", "Offer", "Rejected", "No Response"]).pack(padx=20, pady=5)
+        
+        def apply():
+            dialog.destroy()
+            self.submit_write("set_status_many", app_ids, status_var.get())
+        
+        ttk.Button(dialog, text="Apply", command=apply).pack(pady=(5, 15))
+    
+    def shift_deadlines(self):
+        app_ids = self.selected_ids()
+        if not app_ids:
+            messagebox.showwarning("No Selection", "Please select the applications to update.")
+            return
+        
+        days = simpledialog.askinteger(
+            "Shift Deadlines",
+            f"Move the deadlines of {len(app_ids)} selected by how many days?\n(Negative numbers move them earlier)",
+            parent=self.root
+        )
+        if days:
+            self.submit_write("shift_deadlines_many", app_ids, days)
+    
+    def submit_write(self, method, *args):
+        # Writes run one at a time on the async writer thread; the view
+        # refreshes once the transaction has committed
+        self.async_db.submit(method, *args, callback=self.refresh_after_write, errback=self.on_write_error)
+    
+    def on_write_error(self, error):
+        messagebox.showerror("Update Failed", str(error))
+        self.refresh_after_write()
+    
+    def start_reminders(self):
+        # The version is read before the deadlines, so no change falls between them
+        self.async_db.submit("get_change_version", callback=lambda version: self.async_db.submit(
+            "get_deadline_days", self.reminders.today(),
+            callback=lambda deadline_days: self.reminders.load(version, deadline_days)))
+    
+    def refresh_after_write(self, result=None):
+        # Bulk actions commit in one transaction and refresh once afterwards
         self.load_applications()
+        self.dashboard.refresh()
+        if self.reminders.version is not None:
+            self.read_changes(self.reminders, "reminders")
+    
+    def open_application_form(self, app_id=None):
+        ApplicationForm(self.root, self.async_db, self.submit_write, app_id)
     
     def export_to_csv(self):
         filename = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+            filetypes=[("CSV files", "*.csv"), ("Compressed CSV files", "*.csv.gz"), ("All files", "*.*")]
+        )
+        if filename:
+            ExportDialog(self.root, self.db, self.export_manager, filename)
+    
+    def export_to_excel(self):
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
         )
         if filename:
-            applications = self.db.get_all_applications()
-            self.export_manager.to_csv(applications, filename)
-            messagebox.showinfo("Export Successful", f"Applications exported to {filename}")
+            ExportDialog(self.root, self.db, self.export_manager, filename)
 
-class ApplicationForm:
-    def __init__(self, parent, db, app_id=None):
+class ExportDialog:
+    def __init__(self, parent, db, export_manager, filename):
+        # The export runs on a worker thread; the dialog polls its progress
+        # with after() because Tk widgets may only be touched from this thread
         self.db = db
+        self.export_manager = export_manager
+        self.filename = filename
+        self.cancel_event = threading.Event()
+        self.progress_state = (0, 0)
+        self.outcome = None
+        # Rows per second are measured from here until the worker finishes
+        self.started = time.perf_counter()
+        self.finished = None
+        
+        self.top = tk.Toplevel(parent)
+        self.top.title("Exporting Applications")
+        self.top.geometry("360x140")
+        self.top.resizable(False, False)
+        self.top.transient(parent)
+        self.top.protocol("WM_DELETE_WINDOW", self.cancel)
+        
+        main_frame = ttk.Frame(self.top, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.status_var = tk.StringVar(value="Reading applications...")
+        ttk.Label(main_frame, textvariable=self.status_var).pack(anchor=tk.W, pady=(0, 10))
+        self.progress_bar = ttk.Progressbar(main_frame, orient=tk.HORIZONTAL, mode="determinate", length=320)
+        self.progress_bar.pack(fill=tk.X)
+        self.cancel_button = ttk.Button(main_frame, text="Cancel", command=self.cancel)
+        self.cancel_button.pack(pady=(10, 0))
+        
+        self.worker = threading.Thread(target=self.run, daemon=True)
+        self.worker.start()
+        self.top.after(100, self.poll)
+    
+    def run(self):
+        try:
+            # Rows stream from a cursor straight into the file
+            total = self.db.count_applications()
+            applications = self.db.iter_applications(batch_size=5000)
+            if self.filename.lower().endswith(".xlsx"):
+                export = self.export_manager.to_excel
+            else:
+                export = self.export_manager.to_csv
+            export(applications, self.filename, progress=self.on_progress,
+                   cancel_event=self.cancel_event, total=total)
+            self.finished = time.perf_counter()
+            self.outcome = ("done", None)
+        except ExportCancelled:
+            self.outcome = ("cancelled", None)
+        except Exception as error:
+            self.outcome = ("failed", error)
+    
+    def on_progress(self, written, total):
+        # Called on the worker thread; only plain data is shared
+        self.progress_state = (written, total)
+    
+    def rate(self, written):
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        return f"{written / elapsed:,.0f} rows/s" if elapsed > 0 else "starting"
+    
+    def cancel(self):
+        self.cancel_event.set()
+        self.cancel_button.configure(state=tk.DISABLED)
+        self.status_var.set("Cancelling...")
+    
+    def poll(self):
+        written, total = self.progress_state
+        if total:
+            self.progress_bar.configure(maximum=total, value=written)
+            if not self.cancel_event.is_set():
+                self.status_var.set(f"Exported {written:,} of {total:,} applications ({self.rate(written)})")
+        
+        if self.outcome is None:
+            self.top.after(100, self.poll)
+            return
+        
+        self.top.destroy()
+        result, error = self.outcome
+        if result == "done":
+            messagebox.showinfo("Export Successful",
+                                f"Applications exported to {self.filename} ({self.rate(self.progress_state[0])})")
+        elif result == "cancelled":
+            messagebox.showinfo("Export Cancelled", "The export was cancelled and no file was written.")
+        else:
+            messagebox.showerror("Export Failed", str(error))
+
+class ApplicationForm:
+    def __init__(self, parent, async_db, submit_write, app_id=None):
+        self.async_db = async_db
+        self.submit_write = submit_write
         self.app_id = app_id
         self.app_data = None
         
-        if app_id:
-            # Get existing application data
-            all_apps = self.db.get_all_applications()
-            for app in all_apps:
-                if app["id"] == app_id:
-                    self.app_data = app
-                    break
-        
         self.top = tk.Toplevel(parent)
         self.top.title("Edit Application" if app_id else "Add Application")
         self.top.geometry("400x300")
@@ -188,8 +729,17 @@ class ApplicationForm:
         self.top.grab_set()
         
         self.create_widgets()
-        if self.app_data:
-            self.load_data()
+        if app_id:
+            # Existing data arrives from a reader thread; Save waits for it
+            self.save_button.configure(state=tk.DISABLED)
+            self.async_db.submit("get_application", app_id, callback=self.on_loaded)
+    
+    def on_loaded(self, application):
+        if not self.top.winfo_exists():
+            return
+        self.app_data = application
+        self.load_data()
+        self.save_button.configure(state=tk.NORMAL)
     
     def create_widgets(self):
         main_frame = ttk.Frame(self.top, padding="10")
@@ -234,7 +784,8 @@ class ApplicationForm:
         button_frame = ttk.Frame(main_frame)
         button_frame.grid(row=5, column=0, columnspan=2, pady=10)
         
-        ttk.Button(button_frame, text="Save", command=self.save).pack(side=tk.LEFT, padx=(0, 10))
+        self.save_button = ttk.Button(button_frame, text="Save", command=self.save)
+        self.save_button.pack(side=tk.LEFT, padx=(0, 10))
         ttk.Button(button_frame, text="Cancel", command=self.top.destroy).pack(side=tk.LEFT)
         
         # Configure grid weights
@@ -243,12 +794,12 @@ class ApplicationForm:
     
     def load_data(self):
         if self.app_data:
-            self.company_var.set(self.app_data["company"])
-            self.role_var.set(self.app_data["role"])
-            self.status_var.set(self.app_data["status"])
-            self.deadline_var.set(self.app_data["deadline"] or "")
+            self.company_var.set(self.app_data.company)
+            self.role_var.set(self.app_data.role)
+            self.status_var.set(self.app_data.status)
+            self.deadline_var.set(self.app_data.deadline or "")
             self.notes_text.delete(1.0, tk.END)
-            self.notes_text.insert(1.0, self.app_data["notes"] or "")
+            self.notes_text.insert(1.0, self.app_data.notes or "")
     
     def set_today(self):
         self.deadline_var.set(datetime.now().strftime("%Y-%m-%d"))
@@ -284,9 +835,5 @@ class ApplicationForm:
             notes=notes
         )
         
-        if self.app_id:
-            self.db.update_application(application)
-        else:
-            self.db.add_application(application)
-        
+        self.submit_write("update_application" if self.app_id else "add_application", application)
         self.top.destroy()
\ No newline at end of file
@@ -1,7 +1,11 @@
+import os
 import tkinter as tk
 from tkinter import messagebox
 from auth import AuthenticationManager, AnimatedAuthWindow
-from gui import JobApplicationTracker
+
+# Set JOB_TRACKER_SHARED_DB=1 to keep every user in one shared database
+# instead of a file per user (see database.migrate_user_databases)
+SHARED_DATABASE = os.environ.get("JOB_TRACKER_SHARED_DB") == "1"
 
 class MainApplication:
     def __init__(self):
@@ -28,8 +32,10 @@ class MainApplication:
         for widget in self.root.winfo_children():
             widget.destroy()
             
-        # Create main application
-        self.main_app = JobApplicationTracker(self.root, self.current_user)
+        # Create main application; the tracker and its database, export and
+        # async modules are imported here so they don't delay the login window
+        from gui import JobApplicationTracker
+        self.main_app = JobApplicationTracker(self.root, self.current_user, shared_db=SHARED_DATABASE)
         
         # Add logout button to main app
         logout_button = tk.Button(self.root, text="Logout", command=self.logout, 
@@ -94,6 +100,7 @@ class MainApplication:
         tk.Button(dialog, text="Change Password", command=change_pass).pack(pady=20)
         
     def logout(self):
+        self.main_app.close()
         self.current_user = None
         self.show_auth_window()
         
@@ -1,21 +1,54 @@
+import sys
+from operator import attrgetter
+
+# Every applications column, in the order JobApplication takes them and
+# DatabaseManager selects them
+FIELDS = ("id", "company", "role", "status", "deadline", "notes",
+          "deadline_day", "created_at", "updated_at", "user_id")
+_field_values = attrgetter(*FIELDS)
+
 class JobApplication:
-    def __init__(self, id=None, company="", role="", status="Applied", deadline=None, notes=""):
+    # Slots keep a row at a fraction of the size of a dict; item access and
+    # keys()/values() still let rows be read like one
+    __slots__ = FIELDS
+    FIELDS = FIELDS
+    
+    def __init__(self, id=None, company="", role="", status="Applied", deadline=None, notes="",
+                 deadline_day=None, created_at=None, updated_at=None, user_id=""):
         self.id = id
         self.company = company
         self.role = role
         self.status = status
         self.deadline = deadline
         self.notes = notes
+        self.deadline_day = deadline_day
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.user_id = user_id
+    
+    def __getitem__(self, key):
+        if key not in FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __contains__(self, key):
+        return key in FIELDS
+    
+    def __iter__(self):
+        # Iterates field names like a dict, so list(app) and dict(app) work
+        return iter(FIELDS)
+    
+    def get(self, key, default=None):
+        return getattr(self, key) if key in FIELDS else default
+    
+    def keys(self):
+        return FIELDS
+    
+    def values(self):
+        return _field_values(self)
     
     def to_dict(self):
-        return {
-            "id": self.id,
-            "company": self.company,
-            "role": self.role,
-            "status": self.status,
-            "deadline": self.deadline,
-            "notes": self.notes
-        }
+        return dict(zip(FIELDS, _field_values(self)))
     
     @classmethod
     def from_dict(cls, data):
@@ -25,5 +58,16 @@ class JobApplication:
             role=data.get("role", ""),
             status=data.get("status", "Applied"),
             deadline=data.get("deadline"),
-            notes=data.get("notes", "")
-        )
\ No newline at end of file
+            notes=data.get("notes", ""),
+            deadline_day=data.get("deadline_day"),
+            created_at=data.get("created_at"),
+            updated_at=data.get("updated_at"),
+            user_id=data.get("user_id", "")
+        )
+    
+    @classmethod
+    def from_row(cls, cursor, row):
+        # sqlite3 row factory for queries selecting FIELDS in order. The few
+        # status values are interned so every row shares one string each.
+        id, company, role, status, *rest = row
+        return cls(id, company, role, sys.intern(status), *rest)
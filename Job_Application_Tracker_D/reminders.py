@@ -0,0 +1,120 @@
+import heapq
+from datetime import date, datetime, time, timedelta
+from database import EPOCH_ORDINAL
+
+
+class DeadlineReminders:
+    def __init__(self, root, db, notify, lead_days=1, max_delay=3600000):
+        # Upcoming deadlines are loaded once into a min-heap keyed by the day
+        # each reminder is due. A single Tk after() timer waits for the
+        # earliest one, so nothing runs while no reminder is due. Heap entries
+        # are never removed in place; entries that no longer match self.due
+        # are skipped when they reach the top.
+        self.root = root
+        self.db = db
+        self.notify = notify
+        self.lead_days = lead_days
+        # Long waits are split so the timer recovers from sleep or clock changes
+        self.max_delay = max_delay
+        self.heap = []
+        self.due = {}
+        # Deadlines already reminded about, so unrelated edits don't repeat them
+        self.reminded = {}
+        self.timer = None
+        self.timer_due = None
+        self.version = None
+
+    def start(self):
+        self.version = self.db.get_change_version()
+        self.load(self.version, self.db.get_deadline_days(self.today()))
+
+    def today(self):
+        return date.today().toordinal() - EPOCH_ORDINAL
+
+    def load(self, version, deadline_days):
+        # version must be read before deadline_days, so nothing is missed
+        self.version = version
+        self.due = dict(deadline_days)
+        self.heap = [(deadline_day, app_id) for app_id, deadline_day in self.due.items()]
+        heapq.heapify(self.heap)
+        self.schedule()
+
+    def stop(self):
+        if self.timer is not None:
+            self.root.after_cancel(self.timer)
+            self.timer = None
+            self.timer_due = None
+
+    def _set(self, app_id, deadline_day):
+        if deadline_day is None or deadline_day < self.today() or self.reminded.get(app_id) == deadline_day:
+            # Moving back to an already reminded deadline still drops the old entry
+            self.due.pop(app_id, None)
+        elif self.due.get(app_id) != deadline_day:
+            self.due[app_id] = deadline_day
+            heapq.heappush(self.heap, (deadline_day, app_id))
+
+    def track(self, app_id, deadline_day):
+        self._set(app_id, deadline_day)
+        self.schedule()
+
+    def forget(self, app_id):
+        self.due.pop(app_id, None)
+        self.reminded.pop(app_id, None)
+        self.schedule()
+
+    def apply_changes(self):
+        # Adds, edits and deletes since the last call, read from the change log
+        return self.apply(*self.db.get_changes_since(self.version))
+
+    def apply(self, changes, version):
+        # Changes read from get_changes_since(self.version), possibly on
+        # another thread
+        self.version = version
+        for change in changes:
+            if change["deleted"]:
+                self.due.pop(change["id"], None)
+                self.reminded.pop(change["id"], None)
+            else:
+                self._set(change["id"], change["application"]["deadline_day"])
+        self.schedule()
+        return len(changes)
+
+    def _next_due(self):
+        while self.heap:
+            deadline_day, app_id = self.heap[0]
+            if self.due.get(app_id) == deadline_day:
+                return deadline_day
+            heapq.heappop(self.heap)
+        return None
+
+    def remind_at(self, deadline_day):
+        day = date.fromordinal(deadline_day + EPOCH_ORDINAL) - timedelta(days=self.lead_days)
+        return datetime.combine(day, time())
+
+    def schedule(self):
+        # Keep exactly one timer, aimed at the earliest live entry
+        deadline_day = self._next_due()
+        if deadline_day == self.timer_due and self.timer is not None:
+            return
+        self.stop()
+        if deadline_day is None:
+            return
+        delay = (self.remind_at(deadline_day) - datetime.now()).total_seconds() * 1000
+        self.timer_due = deadline_day
+        self.timer = self.root.after(int(min(max(delay, 0), self.max_delay)), self.on_timer)
+
+    def on_timer(self):
+        self.timer = None
+        self.timer_due = None
+        now = datetime.now()
+        fired = []
+        while True:
+            deadline_day = self._next_due()
+            if deadline_day is None or self.remind_at(deadline_day) > now:
+                break
+            _, app_id = heapq.heappop(self.heap)
+            self.reminded[app_id] = self.due.pop(app_id)
+            fired.append(app_id)
+        if fired:
+            self.notify(self.db.get_applications(fired))
+        self.schedule()